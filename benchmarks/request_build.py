@@ -0,0 +1,62 @@
+"""Measures how many search requests can be built per second
+with and without the request templates, as well as the whole
+path of `Transport.send` (request key, coalescing and request
+creation) without the network
+
+    python -m benchmarks.request_build
+"""
+import argparse
+import time
+
+from youtube_searcher.search import ChannelVideos, Videos
+from youtube_searcher.transport import Transport
+
+
+class NullTransport(Transport):
+    """Creates the request without sending it"""
+
+    def fetch(self, search_instance):
+        return search_instance.create_request()
+
+
+def measure(func, duration: float):
+    count = 0
+    start = time.perf_counter()
+    end = start + duration
+
+    while time.perf_counter() < end:
+        for _ in range(100):
+            func()
+        count = count + 100
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--duration', type=float, default=2)
+    args = parser.parse_args()
+
+    searches = [
+        Videos('Watermelon Sugar'),
+        ChannelVideos('Watermelon Sugar', 'UCZFWPqqPkFlNwIxcpsLOwew')
+    ]
+
+    transport = NullTransport()
+
+    for instance in searches:
+        name = instance.__class__.__name__
+        full = measure(instance.prepare_request, args.duration)
+        template = measure(instance.create_request, args.duration)
+        key = measure(instance.get_request_key, args.duration)
+        send = measure(lambda: transport.send(instance), args.duration)
+
+        print(f'{name}')
+        print(f'  full build:     {full:>10,.0f} requests/s')
+        print(f'  template build: {template:>10,.0f} requests/s')
+        print(f'  speedup:        {template / full:>10.1f}x')
+        print(f'  request key:    {key:>10,.0f} keys/s')
+        print(f'  send path:      {send:>10,.0f} requests/s')
+
+
+if __name__ == '__main__':
+    main()
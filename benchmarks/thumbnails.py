@@ -0,0 +1,84 @@
+"""Measures the cost of building a video from the items of the
+test fixtures when the thumbnails are built eagerly (before) and
+when they are built on access (after)
+
+    python -m benchmarks.thumbnails
+"""
+import argparse
+import json
+import pathlib
+import time
+
+from youtube_searcher.constants import CONTENT_PATH
+from youtube_searcher.extractors import Accessor, video_extractor
+from youtube_searcher.models.videos import ThumbnailModel, VideoModel
+from youtube_searcher.search import Videos
+
+FIXTURE = pathlib.Path(__file__).parent.parent.joinpath(
+    'tests', 'data', 'video_search.json'
+)
+
+
+def load_items():
+    with open(FIXTURE, mode='r', encoding='utf-8') as f:
+        data = json.load(f)
+    return Accessor(CONTENT_PATH)(data)
+
+
+def build_eager(items, search_instance):
+    videos = []
+    for row in video_extractor.extract(items, search_instance):
+        # The thumbnails were built for each
+        # video before they became lazy
+        row['thumbnails'] = [ThumbnailModel(**x) for x in row['thumbnails'].raw]
+        videos.append(VideoModel(**row))
+    return videos
+
+
+def build_lazy(items, search_instance):
+    return [
+        VideoModel(**row)
+        for row in video_extractor.extract(items, search_instance)
+    ]
+
+
+def build_best(items, search_instance):
+    videos = build_lazy(items, search_instance)
+    for video in videos:
+        video.best_thumbnail(max_width=400)
+    return videos
+
+
+def measure(func, items, search_instance, duration: float):
+    """Returns the average time in microseconds
+    that is spent building a single video"""
+    count = 0
+    start = time.perf_counter()
+    end = start + duration
+
+    while time.perf_counter() < end:
+        count = count + len(func(items, search_instance))
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--duration', type=float, default=2)
+    args = parser.parse_args()
+
+    items = load_items()
+    search_instance = Videos('Watermelon Sugar')
+
+    eager = measure(build_eager, items, search_instance, args.duration)
+    lazy = measure(build_lazy, items, search_instance, args.duration)
+    best = measure(build_best, items, search_instance, args.duration)
+
+    print('Per video cost')
+    print(f'  eager thumbnails (before): {eager:>8.2f} us')
+    print(f'  lazy thumbnails (after):   {lazy:>8.2f} us')
+    print(f'  lazy + best_thumbnail:     {best:>8.2f} us')
+    print(f'  speedup:                   {eager / lazy:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import copy
+import gzip
+import json
+import pathlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+from requests import Response
+
+from youtube_searcher.constants import CONTENT_PATH
+
+TEST_DIR = pathlib.Path('.').joinpath('tests').absolute()
+
+
+def load_data(name: str):
+    path = TEST_DIR.joinpath('data', f'{name}.json')
+    with open(path, mode='r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def create_pages(count: int, data: dict = None):
+    """Creates a first search response followed by `count - 1`
+    continuation responses. Each page has distinct video IDs
+    and the last page has no continuation token"""
+    data = data or load_data('video_search')
+
+    items = data
+    for key in CONTENT_PATH:
+        items = items[key]
+
+    pages = []
+    for i in range(count):
+        page_items = copy.deepcopy(items)
+
+        for item in page_items:
+            if 'itemSectionRenderer' in item:
+                for content in item['itemSectionRenderer']['contents']:
+                    if 'videoRenderer' in content:
+                        video = content['videoRenderer']
+                        video['videoId'] = f"{video['videoId']}_{i}"
+            elif 'continuationItemRenderer' in item:
+                command = item['continuationItemRenderer']['continuationEndpoint']['continuationCommand']
+                command['token'] = f'token_{i}'
+
+        if i == count - 1:
+            page_items = [
+                item for item in page_items
+                if 'continuationItemRenderer' not in item
+            ]
+
+        if i == 0:
+            page = copy.deepcopy(data)
+            target = page
+            for key in CONTENT_PATH[:-1]:
+                target = target[key]
+            target[CONTENT_PATH[-1]] = page_items
+        else:
+            page = {
+                'onResponseReceivedCommands': [
+                    {'appendContinuationItemsAction': {
+                        'continuationItems': page_items}}
+                ]
+            }
+        pages.append(page)
+    return pages
+
+
+def create_responses(pages: list[dict]):
+    responses = []
+    for page in pages:
+        response = Mock(spec=Response)
+        response.json.return_value = page
+        responses.append(response)
+    return responses
+
+
+class LocalServer:
+    """A local HTTP server, also usable as a plain http proxy,
+    that answers every request with the configured status code
+    and body after `delay` seconds. The body is gzipped when
+    `compress` is True and the client accepts it"""
+
+    def __init__(self, status_code: int = 200, body: bytes = b'{}', delay: float = 0, compress: bool = False):
+        self.status_code = status_code
+        self.body = body
+        self.delay = delay
+        self.compress = compress
+        self.requests = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers['Content-Length'])
+                server.requests.append({
+                    'url': self.path,
+                    'headers': dict(self.headers),
+                    'payload': json.loads(self.rfile.read(length))
+                })
+
+                time.sleep(server.delay)
+
+                content = server.body
+                self.send_response(server.status_code)
+                self.send_header('Content-Type', 'application/json')
+                if server.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    content = gzip.compress(content)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f'http://{host}:{port}'
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
@@ -103,6 +103,23 @@ class TestSearchVideos(SearchMixin, TestCase):
 
         self.assertTrue(dataclasses.is_dataclass(video.channel))
 
+    def test_path_to_items(self, mock_session: Mock):
+        mock_session.return_value = self.mock_response
+
+        instance = Videos('Search video')
+        instance.path_to_items = 'contents__twoColumnSearchResultsRenderer__primaryContents__sectionListRenderer__contents'
+
+        # An explicit path is used instead of the content
+        # resolver and the response goes through full clean
+        with patch.object(Videos, 'get_items') as get_items, \
+                patch.object(Videos, 'full_clean', side_effect=lambda x: x) as full_clean:
+            values = instance.objects.all()
+
+        get_items.assert_not_called()
+        full_clean.assert_called_once()
+        self.assertGreater(len(values), 0)
+        self.assertEqual(len(values), len(Videos('Search video').objects.all()))
+
 
 @patch.object(Session, 'send')
 class TestSearchChannel(SearchMixin, TestCase):
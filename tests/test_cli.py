@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from requests import Session
+
+from tests.helpers import create_pages, create_responses
+from youtube_searcher.cli import Statistics, main
+
+
+@patch.object(Session, 'send')
+class TestCli(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.page = create_pages(1)[0]
+
+    def run_cli(self, lines: list[str], *args: str):
+        stdin = io.StringIO('\n'.join(lines))
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+
+        with patch('sys.stdin', stdin), redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(list(args))
+        return code, stdout.getvalue(), stderr.getvalue()
+
+    def test_ndjson(self, mock_send: Mock):
+        mock_send.side_effect = lambda *args, **kwargs: create_responses([self.page])[0]
+
+        code, stdout, stderr = self.run_cli(
+            ['Watermelon Sugar', '', 'As It Was'],
+            '--limit', '5', '--concurrency', '2'
+        )
+        self.assertEqual(code, 0)
+
+        rows = [json.loads(line) for line in stdout.splitlines()]
+        self.assertEqual(len(rows), 10)
+        self.assertSetEqual(
+            {row['query'] for row in rows},
+            {'Watermelon Sugar', 'As It Was'}
+        )
+        self.assertIn('Queries: 2 (0 errors)', stderr)
+        self.assertIn('Results: 10', stderr)
+
+    def test_csv(self, mock_send: Mock):
+        mock_send.side_effect = lambda *args, **kwargs: create_responses([self.page])[0]
+
+        code, stdout, _ = self.run_cli(
+            ['Watermelon Sugar'],
+            '--limit', '3', '--format', 'csv', '--fields', 'video_id,view_count'
+        )
+        self.assertEqual(code, 0)
+
+        rows = list(csv.DictReader(io.StringIO(stdout)))
+        self.assertEqual(len(rows), 3)
+        self.assertListEqual(list(rows[0]), ['query', 'video_id', 'view_count'])
+
+    def test_nested_fields(self, mock_send: Mock):
+        mock_send.side_effect = lambda *args, **kwargs: create_responses([self.page])[0]
+
+        code, stdout, _ = self.run_cli(
+            ['Watermelon Sugar'],
+            '--limit', '1', '--fields', 'video_id,thumbnails'
+        )
+        self.assertEqual(code, 0)
+
+        row = json.loads(stdout)
+        self.assertIsInstance(row['thumbnails'], list)
+        self.assertIn('url', row['thumbnails'][0])
+
+        code, stdout, _ = self.run_cli(
+            ['Watermelon Sugar'],
+            '--limit', '1', '--format', 'csv', '--fields', 'thumbnails'
+        )
+        row = next(csv.DictReader(io.StringIO(stdout)))
+        self.assertIn('url', json.loads(row['thumbnails'])[0])
+
+    def test_errors(self, mock_send: Mock):
+        mock_send.side_effect = ConnectionError('Connection refused')
+
+        code, stdout, stderr = self.run_cli(['Watermelon Sugar'])
+        self.assertEqual(code, 1)
+        self.assertEqual(stdout, '')
+        self.assertIn('Queries: 1 (1 errors)', stderr)
+
+
+    def test_input_error(self, mock_send: Mock):
+        mock_send.side_effect = lambda *args, **kwargs: create_responses([self.page])[0]
+
+        def read_lines():
+            yield 'Watermelon Sugar\n'
+            raise UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid start byte')
+
+        stdin = Mock()
+        stdin.__iter__ = lambda _: read_lines()
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+
+        with patch('sys.stdin', stdin), redirect_stdout(stdout), redirect_stderr(stderr):
+            code = main(['--limit', '2'])
+
+        # The queries read before the error still complete
+        self.assertEqual(code, 1)
+        self.assertEqual(len(stdout.getvalue().splitlines()), 2)
+        self.assertIn('Input error: UnicodeDecodeError', stderr.getvalue())
+
+
+class TestStatistics(TestCase):
+    def test_percentile(self):
+        values = [0.1, 0.2, 0.3, 0.4, 1.0]
+        self.assertEqual(Statistics.percentile(values, 50), 0.3)
+        self.assertEqual(Statistics.percentile(values, 95), 1.0)
+        self.assertEqual(Statistics.percentile([], 95), 0)
@@ -0,0 +1,87 @@
+import copy
+import json
+import pathlib
+from unittest import TestCase
+from unittest.mock import Mock
+
+from youtube_searcher.constants import CONTENT_PATH
+from youtube_searcher.extractors import Accessor, Extractor, video_extractor
+
+TEST_DIR = pathlib.Path('.').joinpath('tests').absolute()
+
+
+class TestAccessor(TestCase):
+    def test_nested_value(self):
+        accessor = Accessor('title__runs__0__text')
+        value = {'title': {'runs': [{'text': 'Ep 51'}]}}
+        self.assertEqual(accessor(value), 'Ep 51')
+
+    def test_missing_value(self):
+        accessor = Accessor('lengthText__simpleText', default='N/A')
+        self.assertEqual(accessor({'title': 'Live'}), 'N/A')
+        self.assertEqual(accessor({'lengthText': None}), 'N/A')
+
+    def test_list_path(self):
+        accessor = Accessor(['runs', 0, 'text'])
+        self.assertEqual(accessor({'runs': [{'text': 'Kendall'}]}), 'Kendall')
+
+
+class TestExtractor(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        path = TEST_DIR.joinpath('data', 'video_search.json')
+        with open(path, mode='r', encoding='utf-8') as f:
+            cls.data = json.load(f)
+
+        items = cls.data
+        for key in CONTENT_PATH:
+            items = items[key]
+        cls.items = items
+
+    def setUp(self):
+        self.search = Mock(
+            continuation_key=None,
+            browse_id=None,
+            language='en',
+            fetched_at=None
+        )
+
+    def test_single_pass(self):
+        results = list(video_extractor.extract(self.items, self.search))
+        self.assertEqual(len(results), 19)
+        self.assertIsNotNone(self.search.continuation_key)
+
+        for result in results:
+            with self.subTest(result=result):
+                self.assertIsNotNone(result['video_id'])
+                self.assertIsNotNone(result['channel'].channel_id)
+
+    def test_missing_optional_fields(self):
+        # Livestreams and premieres do not have a lengthText
+        items = copy.deepcopy(self.items)
+        contents = items[0]['itemSectionRenderer']['contents']
+        for content in contents:
+            if 'videoRenderer' in content:
+                del content['videoRenderer']['lengthText']
+
+        results = list(video_extractor.extract(items, self.search))
+        self.assertEqual(len(results), 19)
+        self.assertIsNone(results[0]['duration'])
+
+    def test_register_handler(self):
+        extractor = video_extractor.copy()
+
+        @extractor.register('reelShelfRenderer')
+        def reel_handler(value, search):
+            return {'video_id': 'reel'}
+
+        self.assertNotIn('reelShelfRenderer', video_extractor)
+
+        results = list(extractor.extract(self.items, self.search))
+        reels = [x for x in results if x['video_id'] == 'reel']
+        self.assertEqual(len(reels), 2)
+
+    def test_unknown_renderers(self):
+        extractor = Extractor()
+        results = list(extractor.extract(self.items, self.search))
+        self.assertListEqual(results, [])
@@ -0,0 +1,179 @@
+import concurrent.futures
+import threading
+from collections import Counter
+from unittest import TestCase
+from unittest.mock import patch
+
+from tests.helpers import create_pages, load_data
+from youtube_searcher.graph import GraphCrawler, Node, VisitedSet
+from youtube_searcher.search import ChannelVideos
+from youtube_searcher.transport import Transport
+
+QUERY_PAGE = create_pages(1)[0]
+
+CHANNEL_PAGE = load_data('channel_search')
+
+
+class GraphTransport(Transport):
+    """Returns the search page for the queries and the channel
+    page for the channels and counts the requests per node"""
+
+    def __init__(self, failing: set[str] = frozenset()):
+        super().__init__(coalesce=False)
+        self.failing = failing
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def fetch(self, search_instance):
+        if isinstance(search_instance, ChannelVideos):
+            key = search_instance.browse_id
+            response_data = CHANNEL_PAGE
+        else:
+            key = search_instance.query
+            response_data = QUERY_PAGE
+
+        with self.lock:
+            self.calls[key] += 1
+
+        if key in self.failing:
+            raise ConnectionError('Connection refused')
+        return response_data
+
+
+class TestVisitedSet(TestCase):
+    def test_add(self):
+        visited = VisitedSet()
+        self.assertTrue(visited.add('channel:UC1'))
+        self.assertFalse(visited.add('channel:UC1'))
+        self.assertTrue(visited.add('query:UC1'))
+        self.assertIn('channel:UC1', visited)
+        self.assertNotIn('channel:UC2', visited)
+        self.assertEqual(len(visited), 2)
+
+
+class TestGraphCrawler(TestCase):
+    def test_breadth_first_priority(self):
+        transport = GraphTransport()
+        crawler = GraphCrawler(
+            queries=['Watermelon Sugar'],
+            max_depth=1,
+            budget=None,
+            max_workers=1,
+            transport=transport
+        )
+        expansions = list(crawler.crawl())
+
+        self.assertEqual(expansions[0].node, Node('query', 'Watermelon Sugar'))
+        channels = expansions[0].children
+        self.assertEqual(len(channels), 18)
+        self.assertEqual(len(expansions), 19)
+
+        # The channels are expanded from the one with the
+        # most viewed video to the one with the least
+        nodes = [expansion.node for expansion in expansions[1:]]
+        self.assertListEqual(
+            nodes,
+            sorted(channels, key=lambda x: x.priority, reverse=True)
+        )
+        self.assertEqual(nodes[0].value, 'UCZFWPqqPkFlNwIxcpsLOwew')
+        for node in nodes:
+            self.assertEqual(node.depth, 1)
+
+    def test_each_node_expanded_once(self):
+        transport = GraphTransport()
+        crawler = GraphCrawler(
+            queries=['Watermelon Sugar', 'Watermelon Sugar', 'As It Was'],
+            channels=['UCZFWPqqPkFlNwIxcpsLOwew'],
+            max_depth=3,
+            budget=None,
+            max_workers=4,
+            transport=transport
+        )
+        expansions = list(crawler.crawl())
+
+        self.assertEqual(len(expansions), 20)
+        for key, count in transport.calls.items():
+            with self.subTest(key=key):
+                self.assertEqual(count, 1)
+
+        video_ids = [
+            video.video_id
+            for expansion in expansions
+            for video in expansion.videos
+        ]
+        self.assertEqual(len(video_ids), len(set(video_ids)))
+
+        # The seed channel is at the first depth and
+        # is not queued again when it is discovered
+        depths = Counter(expansion.node.depth for expansion in expansions)
+        self.assertDictEqual(dict(depths), {0: 3, 1: 17})
+
+    def test_budget(self):
+        transport = GraphTransport()
+        crawler = GraphCrawler(
+            queries=['Watermelon Sugar'],
+            budget=5,
+            transport=transport
+        )
+        self.assertEqual(len(list(crawler.crawl())), 5)
+        self.assertEqual(sum(transport.calls.values()), 5)
+        self.assertEqual(crawler.expanded, 5)
+
+    def test_max_depth(self):
+        crawler = GraphCrawler(
+            queries=['Watermelon Sugar'],
+            max_depth=0,
+            transport=GraphTransport()
+        )
+        expansions = list(crawler.crawl())
+        self.assertEqual(len(expansions), 1)
+        self.assertListEqual(expansions[0].children, [])
+
+    def test_errors(self):
+        transport = GraphTransport(failing={'UCZFWPqqPkFlNwIxcpsLOwew'})
+        crawler = GraphCrawler(
+            queries=['Watermelon Sugar'],
+            max_depth=1,
+            budget=None,
+            transport=transport
+        )
+        expansions = list(crawler.crawl())
+        self.assertEqual(len(expansions), 19)
+
+        errors = [x for x in expansions if x.error is not None]
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].node.value, 'UCZFWPqqPkFlNwIxcpsLOwew')
+        self.assertIsInstance(errors[0].error, Exception)
+
+    def test_depths_not_mixed(self):
+        batches = [[]]
+
+        class RecordingCrawler(GraphCrawler):
+            def pop(self):
+                node = super().pop()
+                batches[-1].append(node.depth)
+                return node
+
+        def wait_all(futures, return_when):
+            # Every running expansion completes in the same wait
+            batches.append([])
+            return concurrent.futures.wait(futures)
+
+        crawler = RecordingCrawler(
+            queries=['Watermelon Sugar', 'As It Was', 'Adore You'],
+            max_depth=1,
+            budget=None,
+            max_workers=2,
+            transport=GraphTransport()
+        )
+        with patch('youtube_searcher.graph.wait', side_effect=wait_all):
+            expansions = list(crawler.crawl())
+        self.assertEqual(len(expansions), 21)
+
+        # A node is only submitted once all the
+        # nodes of the previous depths were expanded
+        batches = [batch for batch in batches if batch]
+        self.assertListEqual(batches[:2], [[0, 0], [0]])
+        for batch in batches:
+            with self.subTest(batch=batch):
+                self.assertEqual(len(set(batch)), 1)
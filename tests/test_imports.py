@@ -0,0 +1,49 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+# The cumulative import time of the module, in
+# microseconds, measured in a fresh interpreter
+IMPORT_TIME_BUDGET = 150_000
+
+LAZY_MODULES = ['requests', 'urllib3', 'asyncio', 'pandas', 'pyarrow', 'orjson']
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Imports the module in a new interpreter with `-X importtime`
+    and returns the cumulative import time of each module that
+    was imported"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(TestCase):
+    def test_lazy_dependencies(self):
+        for module in ['youtube_searcher.search', 'youtube_searcher.cli']:
+            with self.subTest(module=module):
+                times = import_times(module)
+                self.assertIn(module, times)
+
+                for name in LAZY_MODULES:
+                    self.assertNotIn(name, times)
+
+    def test_budget(self):
+        # Take the best of a few runs to
+        # avoid failing on a busy machine
+        cumulative = min(
+            import_times('youtube_searcher.search')['youtube_searcher.search']
+            for _ in range(3)
+        )
+        self.assertLess(cumulative, IMPORT_TIME_BUDGET)
@@ -1,7 +1,10 @@
 from unittest import TestCase
+import copy
+import json
 import pathlib
-from dataclasses import is_dataclass
-from youtube_searcher.models.videos import VideoModel
+from dataclasses import asdict, is_dataclass
+from youtube_searcher.models.videos import (LazyThumbnails, SimpleChannelModel,
+                                           ThumbnailModel, VideoModel)
 
 TEST_DIR = pathlib.Path('.').joinpath('tests').absolute()
 
@@ -36,3 +39,77 @@ class TestVideoModel(TestCase):
         for item in self.data:
             result = VideoModel(**item)
             print(result)
+
+
+class TestLazyThumbnails(TestCase):
+    def setUp(self):
+        self.raw = [
+            {'url': 'https://i.ytimg.com/small.jpg', 'width': 360, 'height': 202},
+            {'url': 'https://i.ytimg.com/large.jpg', 'width': 720, 'height': 404},
+            {'url': 'https://i.ytimg.com/medium.jpg', 'width': 480, 'height': 270}
+        ]
+
+    def test_lazy(self):
+        thumbnails = LazyThumbnails(self.raw)
+        self.assertEqual(len(thumbnails), 3)
+        self.assertIsNone(thumbnails.models)
+
+        thumbnail = thumbnails[1]
+        self.assertIsInstance(thumbnail, ThumbnailModel)
+        self.assertEqual(thumbnail.width, 720)
+        self.assertIs(thumbnails[1], thumbnail)
+        self.assertListEqual(thumbnails.models, [None, thumbnail, None])
+
+        self.assertEqual(thumbnails[-1].width, 480)
+        self.assertListEqual([x.width for x in thumbnails[:2]], [360, 720])
+        self.assertEqual(thumbnails, [ThumbnailModel(**x) for x in self.raw])
+
+    def test_best(self):
+        thumbnails = LazyThumbnails(self.raw)
+        self.assertEqual(thumbnails.best().width, 720)
+        self.assertEqual(thumbnails.best(max_width=500).width, 480)
+        # The narrowest thumbnail is returned
+        # when they are all too wide
+        self.assertEqual(thumbnails.best(max_width=100).width, 360)
+        self.assertListEqual(
+            [x is not None for x in thumbnails.models],
+            [True, True, True]
+        )
+        self.assertIsNone(LazyThumbnails().best())
+
+    def test_best_thumbnail(self):
+        video = VideoModel('Title', 'J-G3DPx0pzE', None, None, None, self.raw)
+        self.assertIsInstance(video.thumbnails, LazyThumbnails)
+
+        thumbnail = video.best_thumbnail(max_width=400)
+        self.assertEqual(thumbnail.url, 'https://i.ytimg.com/small.jpg')
+        self.assertListEqual(video.thumbnails.models, [thumbnail, None, None])
+
+        models = [ThumbnailModel(**x) for x in self.raw]
+        video = VideoModel('Title', 'J-G3DPx0pzE', None, None, None, models)
+        self.assertIs(video.best_thumbnail(), models[1])
+
+    def test_to_dict(self):
+        channel = SimpleChannelModel('UCZFWPqqPkFlNwIxcpsLOwew', 'Harry Styles')
+        video = VideoModel('Title', 'J-G3DPx0pzE', None, None, None, self.raw, channel=channel)
+        data = video.to_dict()
+        self.assertListEqual(data['thumbnails'], self.raw)
+        self.assertIsNot(data['thumbnails'][0], self.raw[0])
+        self.assertEqual(data['channel']['channel_id'], 'UCZFWPqqPkFlNwIxcpsLOwew')
+        self.assertListEqual(json.loads(json.dumps(data))['thumbnails'], self.raw)
+
+        # The thumbnails stay lazy when the
+        # video is converted with asdict
+        self.assertIsInstance(asdict(video)['thumbnails'], LazyThumbnails)
+
+    def test_deepcopy(self):
+        video = VideoModel('Title', 'J-G3DPx0pzE', None, None, None, self.raw)
+        result = copy.deepcopy(video)
+        self.assertIsInstance(result.thumbnails, LazyThumbnails)
+        self.assertEqual(result.thumbnails, video.thumbnails)
+        self.assertIsNot(result.thumbnails.raw[0], self.raw[0])
+        self.assertEqual(result.best_thumbnail().width, 720)
+
+        thumbnails = copy.deepcopy(video.thumbnails)
+        self.assertIsInstance(thumbnails, LazyThumbnails)
+        self.assertEqual(thumbnails, video.thumbnails)
@@ -0,0 +1,123 @@
+import datetime
+import unittest
+from unittest import TestCase
+
+from youtube_searcher.models.videos import VideoModel
+from youtube_searcher.normalizers import (DAY, WEEK, YEAR, normalize_dataframe,
+                                          normalize_page, parse_duration,
+                                          parse_publication_offset,
+                                          parse_view_count)
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+REFERENCE = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class TestParsers(TestCase):
+    def test_view_count(self):
+        values = [
+            ('1,234,567 views', 'en', 1234567),
+            ('1 view', 'en', 1),
+            ('No views', 'en', 0),
+            ('1.2M views', 'en', 1200000),
+            ('12K views', 'en', 12000),
+            ('1 234 567 vues', 'fr', 1234567),
+            ('1,2 M de vues', 'fr', 1200000),
+            ('1.234.567 Aufrufe', 'de', 1234567),
+            ('1,2 Mio. Aufrufe', 'de', 1200000),
+            ('3,4 mil visualizações', 'pt', 3400),
+            ('1.234 visualizaciones', 'es-ES', 1234),
+            (None, 'en', None)
+        ]
+        for text, language, expected in values:
+            with self.subTest(text=text):
+                self.assertEqual(parse_view_count(text, language), expected)
+
+    def test_duration(self):
+        self.assertEqual(parse_duration('3:09'), 189)
+        self.assertEqual(parse_duration('1:02:03'), 3723)
+        self.assertIsNone(parse_duration('LIVE'))
+        self.assertIsNone(parse_duration(None))
+
+    def test_publication_offset(self):
+        values = [
+            ('3 weeks ago', 'en', 3 * WEEK),
+            ('Streamed 1 day ago', 'en', DAY),
+            ('il y a 4 ans', 'fr', 4 * YEAR),
+            ('vor 2 Tagen', 'de', 2 * DAY),
+            ('hace 3 semanas', 'es', 3 * WEEK),
+            ('Premieres soon', 'en', None)
+        ]
+        for text, language, expected in values:
+            with self.subTest(text=text):
+                result = parse_publication_offset(text, language)
+                self.assertEqual(result, expected)
+
+
+class TestVideoModel(TestCase):
+    def test_lazy_fields(self):
+        video = VideoModel(
+            title='Watermelon Sugar',
+            video_id='E07s5ZYygMg',
+            publication_text='4 years ago',
+            duration='3:09',
+            view_count_text='399,813,105 views',
+            fetched_at=REFERENCE
+        )
+        self.assertEqual(video.view_count, 399813105)
+        self.assertEqual(video.duration_seconds, 189)
+        self.assertEqual(video.published_at, REFERENCE -
+                         datetime.timedelta(seconds=4 * YEAR))
+
+    def test_normalize_page(self):
+        items = normalize_page(
+            [{'view_count_text': '12 views', 'duration': '0:12'}],
+            reference=REFERENCE
+        )
+        self.assertEqual(items[0]['view_count'], 12)
+        self.assertEqual(items[0]['duration_seconds'], 12)
+        self.assertIsNone(items[0]['published_at'])
+
+
+@unittest.skipIf(pandas is None, 'pandas is not installed')
+class TestNormalizeDataFrame(TestCase):
+    def test_matches_parsers(self):
+        texts = [
+            ('1,234,567 views', '12:34', '3 weeks ago'),
+            ('1.2M views', '1:02:03', '1 year ago'),
+            ('No views', None, None),
+            (None, 'LIVE', 'Streamed 2 hours ago')
+        ]
+        df = pandas.DataFrame(
+            texts,
+            columns=['view_count_text', 'duration', 'publication_text']
+        )
+        df = normalize_dataframe(df, reference=REFERENCE)
+
+        for i, (view_count_text, duration, publication_text) in enumerate(texts):
+            with self.subTest(row=i):
+                row = df.iloc[i]
+
+                expected = parse_view_count(view_count_text)
+                if expected is None:
+                    self.assertTrue(pandas.isna(row['view_count']))
+                else:
+                    self.assertEqual(row['view_count'], expected)
+
+                expected = parse_duration(duration)
+                if expected is None:
+                    self.assertTrue(pandas.isna(row['duration_seconds']))
+                else:
+                    self.assertEqual(row['duration_seconds'], expected)
+
+                expected = parse_publication_offset(publication_text)
+                if expected is None:
+                    self.assertTrue(pandas.isna(row['published_at']))
+                else:
+                    self.assertEqual(
+                        row['published_at'],
+                        REFERENCE - datetime.timedelta(seconds=expected)
+                    )
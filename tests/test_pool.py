@@ -0,0 +1,181 @@
+import json
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from requests import HTTPError, Response
+
+from tests.helpers import LocalServer, create_pages
+from youtube_searcher.pool import (DEFAULT_PROFILE, ClientPool, ClientProfile,
+                                   PoolMember)
+from youtube_searcher.search import Videos
+from youtube_searcher.transport import Transport
+
+
+class LocalVideos(Videos):
+    # Plain http so that the local servers used as proxies
+    # receive the request instead of a CONNECT tunnel
+    base_url = 'http://youtube.test/youtubei/v1/search'
+
+
+class TestClientPool(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.body = json.dumps(create_pages(1)[0]).encode('utf-8')
+
+    def setUp(self):
+        self.proxies = []
+
+    def tearDown(self):
+        for proxy in self.proxies:
+            proxy.stop()
+
+    def create_proxy(self, status_code: int = 200, delay: float = 0):
+        proxy = LocalServer(status_code, self.body, delay)
+        self.proxies.append(proxy)
+        return proxy
+
+    def search(self, transport: Transport, query: str = 'Watermelon Sugar'):
+        instance = LocalVideos(query, limit=5)
+        instance.transport = transport
+        return instance.objects.all()
+
+    def test_least_loaded(self):
+        proxy1 = self.create_proxy()
+        proxy2 = self.create_proxy()
+
+        pool = ClientPool.from_proxies([proxy1.url, proxy2.url])
+        transport = Transport(coalesce=False, pool=pool)
+
+        for i in range(4):
+            self.assertEqual(len(self.search(transport, f'Query {i}')), 5)
+
+        self.assertEqual(len(proxy1.requests), 2)
+        self.assertEqual(len(proxy2.requests), 2)
+        self.assertTrue(proxy1.requests[0]['url'].startswith(
+            'http://youtube.test/youtubei/v1/search'))
+
+    def test_profiles(self):
+        proxy1 = self.create_proxy()
+        proxy2 = self.create_proxy()
+
+        profiles = [
+            ClientProfile(user_agent='Agent 1', client_version='1.0'),
+            ClientProfile(user_agent='Agent 2', client_version='2.0')
+        ]
+        pool = ClientPool.from_proxies([proxy1.url, proxy2.url], profiles)
+        transport = Transport(coalesce=False, pool=pool)
+
+        self.search(transport, 'Query 1')
+        self.search(transport, 'Query 2')
+
+        for proxy, profile in zip([proxy1, proxy2], profiles):
+            with self.subTest(profile=profile):
+                request = proxy.requests[0]
+                self.assertEqual(
+                    request['headers']['User-Agent'], profile.user_agent)
+                self.assertEqual(
+                    request['payload']['context']['client']['clientVersion'],
+                    profile.client_version
+                )
+
+    def test_profile_not_stored(self):
+        proxy = self.create_proxy()
+        profile = ClientProfile(user_agent='Agent 1', client_version='1.0')
+        pool = ClientPool.from_proxies([proxy.url], [profile])
+        transport = Transport(coalesce=False, pool=pool)
+
+        instance = LocalVideos('Watermelon Sugar', limit=5)
+        instance.transport = transport
+        key = instance.get_request_key()
+        instance.objects.all()
+
+        # The profile of the member is only used for
+        # the request and does not change the search
+        self.assertEqual(proxy.requests[0]['headers']['User-Agent'], 'Agent 1')
+        self.assertIs(instance.client_profile, DEFAULT_PROFILE)
+        self.assertEqual(instance.get_request_key(), key)
+        self.assertEqual(key, LocalVideos('Watermelon Sugar').get_request_key())
+
+    def test_ejection(self):
+        throttled = self.create_proxy(status_code=429)
+        healthy = self.create_proxy()
+
+        pool = ClientPool.from_proxies(
+            [throttled.url, healthy.url], ejection_time=0.2)
+        transport = Transport(coalesce=False, pool=pool)
+
+        for i in range(4):
+            self.assertEqual(len(self.search(transport, f'Query {i}')), 5)
+
+        # The throttled proxy is tried once and then ejected
+        self.assertEqual(len(throttled.requests), 1)
+        self.assertEqual(len(healthy.requests), 4)
+
+        member = pool.members[0]
+        self.assertFalse(member.is_healthy())
+        self.assertEqual(len(pool.healthy_members), 1)
+
+        time.sleep(0.25)
+        self.assertTrue(member.is_healthy())
+
+    def test_all_members_failing(self):
+        proxy1 = self.create_proxy(status_code=503)
+        proxy2 = self.create_proxy(status_code=500)
+
+        pool = ClientPool.from_proxies([proxy1.url, proxy2.url])
+        transport = Transport(coalesce=False, pool=pool, max_attempts=2)
+
+        with self.assertRaises(Exception):
+            self.search(transport)
+
+        self.assertEqual(len(pool.healthy_members), 0)
+
+    def test_timeout(self):
+        stalled = self.create_proxy(delay=2)
+        healthy = self.create_proxy()
+
+        pool = ClientPool.from_proxies([stalled.url, healthy.url])
+        transport = Transport(coalesce=False, pool=pool, timeout=0.2)
+
+        start = time.perf_counter()
+        self.assertEqual(len(self.search(transport)), 5)
+        self.assertLess(time.perf_counter() - start, 1)
+
+        # The stalled proxy counts as a failure
+        self.assertEqual(len(stalled.requests), 1)
+        self.assertEqual(len(healthy.requests), 1)
+        self.assertFalse(pool.members[0].is_healthy())
+        self.assertEqual(pool.members[0].failures, 1)
+
+    def test_failed_response_closed(self):
+        pool = ClientPool([PoolMember()])
+        transport = Transport(coalesce=False, pool=pool, max_attempts=1)
+
+        response = Mock(spec=Response)
+        response.status_code = 503
+        response.raise_for_status.side_effect = HTTPError('503 Server Error')
+
+        with patch.object(pool.members[0].session, 'send', return_value=response):
+            with self.assertRaises(HTTPError):
+                transport.fetch(LocalVideos('Watermelon Sugar'))
+        response.close.assert_called_once()
+
+    def test_exponential_ejection(self):
+        pool = ClientPool([PoolMember()], ejection_time=1, max_ejection_time=3)
+        member = pool.members[0]
+
+        ejections = []
+        for _ in range(3):
+            pool.acquire()
+            pool.release(member, status_code=429)
+            ejections.append(member.ejected_until - time.monotonic())
+
+        self.assertAlmostEqual(ejections[0], 1, places=1)
+        self.assertAlmostEqual(ejections[1], 2, places=1)
+        self.assertAlmostEqual(ejections[2], 3, places=1)
+
+        pool.acquire()
+        pool.release(member, status_code=200)
+        self.assertTrue(member.is_healthy())
+        self.assertEqual(member.in_flight, 0)
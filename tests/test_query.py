@@ -1,10 +1,17 @@
 import dataclasses
 import json
 import pathlib
+import tracemalloc
 from unittest import TestCase
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
-from youtube_searcher.query import Query, QueryDict, QueryList, ResultsIterator
+from requests import Session
+
+from tests.helpers import create_pages, create_responses, load_data
+from youtube_searcher.query import (Condition, Query, QueryDict, QueryList,
+                                    QuerySet, ResultsIterator)
+from youtube_searcher.models.videos import VideoModel
+from youtube_searcher.search import ChannelVideos, Videos
 
 TEST_DIR = pathlib.Path('.').joinpath('tests').absolute()
 
@@ -66,6 +73,29 @@ class TestQueryDict(TestCase):
         self.assertFalse(result)
 
 
+    def test_list_first_key(self):
+        instance = QueryDict({'ages': [{'europe': 19}], 'names': []})
+
+        qs = instance.filter('ages')
+        self.assertIsInstance(qs, QueryList)
+        self.assertDictEqual(qs[0].cache, {'europe': 19})
+
+        qs = instance.filter('names')
+        self.assertIsInstance(qs, QueryList)
+        self.assertEqual(len(qs), 0)
+
+        # A missing key still returns an empty QueryDict
+        self.assertIsNone(instance.filter('unknown').cache)
+
+    def test_model(self):
+        raw = [{'url': 'https://i.ytimg.com/small.jpg', 'width': 360, 'height': 202}]
+        video = VideoModel('Title', 'J-G3DPx0pzE', None, None, None, raw)
+
+        thumbnails = QueryDict(video).filter('thumbnails')
+        self.assertIsInstance(thumbnails, QueryList)
+        self.assertListEqual([x.cache for x in thumbnails], raw)
+
+
 class TestQueryList(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -130,3 +160,236 @@ class TestResultIterator(TestCase):
             #         self.assertTrue(dataclasses.is_dataclass(item))
 
             # self.mocked_search.assert_called_once()
+
+
+@patch.object(Session, 'send')
+class TestQuerySet(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = create_pages(3)
+
+    def setUp(self):
+        self.instance = Videos('Watermelon Sugar', limit=None)
+
+    def test_lazy(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+
+        qs = self.instance.objects.filter(duration_seconds__lt=600)
+        self.assertIsInstance(qs, QuerySet)
+        mock_send.assert_not_called()
+
+    def test_first_stops_fetching(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+
+        item = self.instance.objects.first()
+        self.assertIsNotNone(item)
+        self.assertEqual(mock_send.call_count, 1)
+
+    def test_slice_stops_fetching(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+
+        items = list(self.instance.objects[:25])
+        self.assertEqual(len(items), 25)
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_count_follows_pages(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+
+        self.assertEqual(self.instance.objects.count(), 57)
+        self.assertEqual(mock_send.call_count, 3)
+
+    def test_limit(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+
+        instance = Videos('Watermelon Sugar', limit=19)
+        self.assertEqual(instance.objects.count(), 19)
+        self.assertEqual(mock_send.call_count, 1)
+
+    def test_default_limit(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+
+        # Only the first page is requested when
+        # no limit is given explicitly
+        instance = Videos('Watermelon Sugar')
+        self.assertEqual(len(instance.objects.all()), 19)
+        self.assertEqual(mock_send.call_count, 1)
+
+    def test_default_limit_channel(self, mock_send: Mock):
+        mock_send.side_effect = create_responses([load_data('channel_search')])
+
+        instance = ChannelVideos('Watermelon Sugar', 'UCZFWPqqPkFlNwIxcpsLOwew')
+        self.assertEqual(len(instance.objects.all()), 13)
+        self.assertEqual(mock_send.call_count, 1)
+
+    def test_filter_and_exclude(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+
+        qs = self.instance.objects.filter(
+            duration_seconds__lt=600,
+            channel__channel_id='UCZFWPqqPkFlNwIxcpsLOwew'
+        )
+        qs = qs.exclude(title__icontains='audio')
+
+        items = list(qs)
+        self.assertEqual(len(items), 3)
+        for item in items:
+            with self.subTest(item=item):
+                self.assertLess(item.duration_seconds, 600)
+                self.assertEqual(
+                    item.channel.channel_id, 'UCZFWPqqPkFlNwIxcpsLOwew')
+                self.assertNotIn('audio', item.title.lower())
+
+    def test_order_by_top_k(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+        expected = sorted(
+            Videos('Watermelon Sugar', limit=None).objects.all(),
+            key=lambda x: x.view_count,
+            reverse=True
+        )
+
+        mock_send.side_effect = create_responses(self.pages)
+        items = list(self.instance.objects.order_by('-view_count')[:5])
+        self.assertListEqual(
+            [x.view_count for x in items],
+            [x.view_count for x in expected[:5]]
+        )
+
+    def test_index(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(self.pages)
+
+        item = self.instance.objects.filter(video_id__endswith='_1')[0]
+        self.assertTrue(item.video_id.endswith('_1'))
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_filter_after_slice(self, mock_send: Mock):
+        with self.assertRaises(ValueError):
+            self.instance.objects[:5].filter(title='Kendall')
+
+
+class TestCondition(TestCase):
+    def test_lookups(self):
+        item = {'name': 'Kendall', 'age': 25, 'location': {'country': 'USA'}}
+
+        values = [
+            ('name', 'Kendall', True),
+            ('name__iexact', 'kendall', True),
+            ('name__contains', 'end', True),
+            ('name__in', ['Kylie'], False),
+            ('age__gte', 25, True),
+            ('age__lt', 25, False),
+            ('location__country', 'USA', True),
+            ('location__city__isnull', True, True),
+            ('location__city__gt', 2, False)
+        ]
+        for lookup, value, expected in values:
+            with self.subTest(lookup=lookup):
+                self.assertEqual(Condition(lookup, value)(item), expected)
+
+
+class PageResponse:
+    """A lightweight response that decodes a fresh copy of the page
+    so that the test fixtures do not keep the pages alive"""
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+@patch.object(Session, 'send')
+class TestIterator(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pages = create_pages(3)
+        cls.first_page = json.dumps(pages[0]).encode('utf-8')
+        cls.continuation_page = json.dumps(pages[1]).encode('utf-8')
+
+    def create_send(self, count: int):
+        calls = []
+
+        def send(request, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                return PageResponse(self.first_page)
+
+            # Replace the token so that each
+            # continuation page is distinct
+            content = self.continuation_page.replace(
+                b'token_1', f'token_{len(calls)}'.encode('utf-8'))
+            if len(calls) == count:
+                content = content.replace(
+                    b'"continuationItemRenderer"', b'"unknownRenderer"')
+            return PageResponse(content)
+        return send
+
+    def measure_peak(self, mock_send: Mock, count: int):
+        mock_send.side_effect = self.create_send(count)
+        instance = Videos('Watermelon Sugar', limit=None)
+
+        tracemalloc.start()
+        total = 0
+        for _ in instance.objects.iterator(chunk_size=10):
+            total = total + 1
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertEqual(total, count * 19)
+        self.assertEqual(mock_send.call_count, count)
+        self.assertIsNone(instance.objects.response_data)
+        mock_send.reset_mock()
+        return peak
+
+    def test_iterator(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(create_pages(3))
+
+        instance = Videos('Watermelon Sugar', limit=40)
+        items = list(instance.objects.iterator(chunk_size=7))
+        self.assertEqual(len(items), 40)
+        self.assertEqual(mock_send.call_count, 3)
+
+    def test_iterator_twice(self, mock_send: Mock):
+        pages = create_pages(3)
+        mock_send.side_effect = create_responses([pages[0]] * 3)
+
+        instance = Videos('Watermelon Sugar', limit=5)
+        first = [x.video_id for x in instance.objects.iterator()]
+        second = [x.video_id for x in instance.objects.iterator()]
+
+        # Each run starts from the first page even though
+        # the previous one stopped before the end of it
+        self.assertEqual(len(first), 5)
+        self.assertListEqual(first, second)
+        self.assertTrue(all(x.endswith('_0') for x in first))
+
+        items = instance.objects.all()
+        self.assertListEqual([x.video_id for x in items], first)
+        self.assertEqual(mock_send.call_count, 3)
+
+    def test_continuation_key(self, mock_send: Mock):
+        pages = create_pages(3)
+        mock_send.side_effect = create_responses(pages[2:])
+
+        instance = Videos('Watermelon Sugar', limit=None)
+        pages = list(instance.objects.iter_pages(cache=False, continuation_key='token_1'))
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(mock_send.call_count, 1)
+
+    def test_token_cycle(self, mock_send: Mock):
+        pages = create_pages(3)
+        # The third page points back to the
+        # token of the first page
+        cycle = json.loads(json.dumps(pages[1]).replace('token_1', 'token_0'))
+        mock_send.side_effect = create_responses([pages[0], pages[1], cycle, pages[1]])
+
+        instance = Videos('Watermelon Sugar', limit=None)
+        items = list(instance.objects.iterator())
+        self.assertEqual(len(items), 57)
+        self.assertEqual(mock_send.call_count, 3)
+
+    def test_constant_memory(self, mock_send: Mock):
+        peak_small = self.measure_peak(mock_send, 4)
+        peak_large = self.measure_peak(mock_send, 32)
+
+        # The peak should not grow with the number of pages
+        self.assertLess(peak_large, peak_small * 1.25)
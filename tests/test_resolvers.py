@@ -0,0 +1,109 @@
+import contextlib
+import copy
+import io
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from requests import Session
+
+from tests.helpers import create_pages, create_responses
+from youtube_searcher.constants import CONTENT_PATH, FALLBACK_CONTENT_PATH
+from youtube_searcher.resolvers import LayoutResolver
+from youtube_searcher.search import Videos
+
+
+def rich_grid_response(data: dict):
+    """Moves the items of a search response to
+    the rich grid layout"""
+    data = copy.deepcopy(data)
+    primary_contents = data['contents']['twoColumnSearchResultsRenderer']['primaryContents']
+    section_list = primary_contents.pop('sectionListRenderer')
+    primary_contents['richGridRenderer'] = section_list
+    return data
+
+
+class TestLayoutResolver(TestCase):
+    def setUp(self):
+        self.resolver = LayoutResolver({
+            'first': ['a', 'items'],
+            'second': ['b', 0, 'items']
+        })
+
+    def test_resolve(self):
+        self.assertEqual(
+            self.resolver.resolve({'a': {'items': [1]}}),
+            ('first', [1])
+        )
+        self.assertEqual(
+            self.resolver.resolve({'b': [{'items': [2]}]}),
+            ('second', [2])
+        )
+        self.assertEqual(self.resolver.resolve({'c': []}), (None, []))
+        self.assertDictEqual(
+            self.resolver.stats(),
+            {'first': 1, 'second': 1, 'misses': 1}
+        )
+
+    def test_last_layout_first(self):
+        self.assertListEqual(self.resolver.layouts, ['first', 'second'])
+
+        self.resolver({'b': [{'items': [2]}]})
+        self.assertEqual(self.resolver.last_layout, 'second')
+        self.assertListEqual(self.resolver.layouts, ['second', 'first'])
+
+        # A response that misses does not
+        # change the memoized layout
+        self.resolver({})
+        self.assertEqual(self.resolver.last_layout, 'second')
+
+        self.resolver.reset()
+        self.assertListEqual(self.resolver.layouts, ['first', 'second'])
+
+    def test_not_a_list(self):
+        self.assertEqual(self.resolver({'a': {'items': 'text'}}), [])
+        self.assertEqual(self.resolver.misses, 1)
+
+    def test_no_layouts(self):
+        with self.assertRaises(ValueError):
+            LayoutResolver({})
+
+
+@patch.object(Session, 'send')
+class TestVideosLayouts(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.data = create_pages(1)[0]
+
+    def setUp(self):
+        self.resolver = LayoutResolver({
+            'section_list': CONTENT_PATH,
+            'rich_grid': FALLBACK_CONTENT_PATH
+        })
+        self.patcher = patch.object(Videos, 'content_resolver', self.resolver)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+
+    def test_layouts(self, mock_send: Mock):
+        pages = [self.data, rich_grid_response(self.data)]
+        mock_send.side_effect = create_responses(pages)
+
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            section_list = Videos('Kendall', limit=None).objects[:100]
+            rich_grid = Videos('Kendall', limit=None).objects[:100]
+
+        self.assertEqual(len(section_list), 19)
+        self.assertListEqual(
+            [x.video_id for x in rich_grid],
+            [x.video_id for x in section_list]
+        )
+        self.assertEqual(self.resolver.last_layout, 'rich_grid')
+        self.assertDictEqual(
+            self.resolver.stats(),
+            {'section_list': 1, 'rich_grid': 1, 'misses': 0}
+        )
+        # Traversing the layouts that do not
+        # match does not print warnings
+        self.assertEqual(stdout.getvalue(), '')
@@ -0,0 +1,166 @@
+import pathlib
+import sqlite3
+import tempfile
+import time
+import unittest
+from unittest import TestCase
+from unittest.mock import Mock
+
+from tests.helpers import create_pages
+from youtube_searcher.models.videos import (SimpleChannelModel, ThumbnailModel,
+                                            VideoModel)
+from youtube_searcher.search import Videos
+from youtube_searcher.sinks import ParquetSink, SQLiteSink
+from youtube_searcher.transport import Transport
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+def create_videos(count: int, channel_id: str = 'UC1'):
+    for i in range(count):
+        yield VideoModel(
+            title=f'Video {i}',
+            video_id=f'video_{i}',
+            publication_text='4 years ago',
+            duration='3:09',
+            view_count_text='1,234 views',
+            thumbnails=[ThumbnailModel('https://i.ytimg.com', 360, 202)],
+            search_key=f'key_{i}',
+            channel=SimpleChannelModel(channel_id, 'Harry Styles')
+        )
+
+
+class TestSQLiteSink(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name).joinpath('videos.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_batched_writes(self):
+        sink = SQLiteSink(self.path, batch_size=10, flush_interval=None)
+        for video in create_videos(25):
+            sink.write(video)
+
+        # Only the complete batches should have been written
+        self.assertEqual(sink.total_written, 20)
+        self.assertEqual(len(sink.buffer), 5)
+
+        sink.close()
+        self.assertEqual(sink.total_written, 25)
+
+    def test_upsert(self):
+        with SQLiteSink(self.path) as sink:
+            sink.consume(create_videos(5, channel_id='UC1'))
+            sink.consume(create_videos(5, channel_id='UC2'))
+
+            values = sink.values_list('video_id', 'channel__channel_id')
+            self.assertEqual(len(values), 5)
+            for value in values:
+                with self.subTest(value=value):
+                    self.assertEqual(value['channel__channel_id'], 'UC2')
+
+    def test_indexes(self):
+        with SQLiteSink(self.path):
+            pass
+
+        connection = sqlite3.connect(self.path)
+        indexes = connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ).fetchall()
+        connection.close()
+
+        names = [x[0] for x in indexes]
+        self.assertIn('idx_videos_channel__channel_id', names)
+        self.assertIn('idx_videos_search_key', names)
+
+    def test_flush_between_pages(self):
+        sink = SQLiteSink(self.path, batch_size=500, flush_interval=0.05)
+        written = []
+
+        def slow_page():
+            yield from create_videos(2)
+            # The next page takes a while to be requested
+            time.sleep(0.1)
+
+        def pages():
+            yield slow_page()
+            written.append(sink.total_written)
+            yield create_videos(2, channel_id='UC2')
+
+        self.assertEqual(sink.consume_pages(pages()), 2 + 2)
+        self.assertListEqual(written, [2])
+        sink.close()
+
+    def test_pipe(self):
+        page = create_pages(1)[0]
+        transport = Mock(spec=Transport)
+        transport.send.return_value = page
+
+        instance = Videos('Watermelon Sugar')
+        instance.transport = transport
+
+        with SQLiteSink(self.path) as sink:
+            self.assertEqual(instance.objects.pipe(sink), 19)
+            self.assertEqual(len(sink.values_list('video_id')), 19)
+
+        # The pages are not cached on the iterator
+        self.assertIsNone(instance.objects.response_data)
+
+    def test_values_list_invalid_field(self):
+        with SQLiteSink(self.path) as sink:
+            with self.assertRaises(ValueError):
+                sink.values_list('unknown')
+
+
+@unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+class TestParquetSink(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name).joinpath('videos.parquet')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_row_groups(self):
+        import pyarrow.parquet
+
+        with ParquetSink(self.path, batch_size=10, flush_interval=None) as sink:
+            sink.consume(create_videos(25))
+
+        parquet_file = pyarrow.parquet.ParquetFile(self.path)
+        self.assertEqual(parquet_file.metadata.num_rows, 25)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+
+    def test_values_list(self):
+        sink = ParquetSink(self.path)
+        sink.consume(create_videos(3))
+
+        values = sink.values_list('video_id', 'title')
+        self.assertEqual(values[0]['video_id'], 'video_0')
+        self.assertEqual(values[-1]['title'], 'Video 2')
+
+    def test_write_after_read(self):
+        import pyarrow.parquet
+
+        sink = ParquetSink(self.path, batch_size=2, flush_interval=None)
+        sink.consume(create_videos(3))
+        self.assertEqual(len(sink.values_list('video_id')), 3)
+
+        sink.consume(create_videos(2, channel_id='UC2'))
+        values = sink.values_list('channel__channel_id')
+        self.assertEqual(len(values), 5)
+        self.assertEqual(values[-1]['channel__channel_id'], 'UC2')
+
+        sink.close()
+        parquet_file = pyarrow.parquet.ParquetFile(self.path)
+        self.assertEqual(parquet_file.metadata.num_rows, 5)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        self.assertFalse(pathlib.Path(f'{self.path}.tmp').exists())
+
+        with self.assertRaises(ValueError):
+            sink.consume(create_videos(1))
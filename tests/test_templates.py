@@ -0,0 +1,87 @@
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+from youtube_searcher.search import ChannelVideos, Videos
+from youtube_searcher.templates import RequestTemplate, TemplateCache
+
+
+class TestRequestTemplate(TestCase):
+    def assertRequestsEqual(self, instance):
+        _, expected = instance.prepare_request()
+        _, request = instance.create_request()
+
+        self.assertEqual(request.method, expected.method)
+        self.assertEqual(request.url, expected.url)
+        self.assertDictEqual(
+            json.loads(request.body),
+            json.loads(expected.body)
+        )
+        self.assertDictEqual(dict(request.headers), dict(expected.headers))
+
+    def test_videos(self):
+        instance = Videos('Watermelon "Sugar"', language='fr', region='FR')
+        self.assertRequestsEqual(instance)
+
+        instance.continuation_key = 'token_1'
+        self.assertRequestsEqual(instance)
+
+    def test_channel_videos(self):
+        instance = ChannelVideos('Watermelon', 'UCZFWPqqPkFlNwIxcpsLOwew')
+        self.assertRequestsEqual(instance)
+
+        instance.continuation_key = 'token_1'
+        self.assertRequestsEqual(instance)
+
+    def test_render_empty_payload(self):
+        template = RequestTemplate('https://www.youtube.com', {}, {})
+        self.assertEqual(template.render({}), b'{}')
+        self.assertDictEqual(
+            json.loads(template.render({'query': 'Kendall'})),
+            {'query': 'Kendall'}
+        )
+
+
+class TestRequestKey(TestCase):
+    def test_request_key(self):
+        key = Videos('Watermelon Sugar').get_request_key()
+        self.assertEqual(key, Videos('Watermelon Sugar').get_request_key())
+        self.assertNotEqual(key, Videos('As It Was').get_request_key())
+        self.assertNotEqual(key, Videos('Watermelon Sugar', region='FR').get_request_key())
+
+        instance = Videos('Watermelon Sugar')
+        instance.continuation_key = 'token_1'
+        self.assertNotEqual(key, instance.get_request_key())
+
+        self.assertNotEqual(
+            ChannelVideos('', 'UC1').get_request_key(),
+            ChannelVideos('', 'UC2').get_request_key()
+        )
+
+    def test_payload_not_serialized(self):
+        instance = Videos('Watermelon Sugar')
+        with patch.object(Videos, 'get_payload') as get_payload:
+            hash(instance.get_request_key())
+        get_payload.assert_not_called()
+
+
+class TestTemplateCache(TestCase):
+    def test_reuse(self):
+        cache = TemplateCache()
+
+        template1 = cache.get(Videos('Watermelon Sugar'))
+        template2 = cache.get(Videos('As It Was'))
+        self.assertIs(template1, template2)
+
+        template3 = cache.get(Videos('As It Was', region='FR'))
+        self.assertIsNot(template1, template3)
+
+        template4 = cache.get(ChannelVideos('As It Was', 'UC1'))
+        self.assertIsNot(template1, template4)
+        self.assertEqual(len(cache), 3)
+
+    def test_maxsize(self):
+        cache = TemplateCache(maxsize=1)
+        cache.get(Videos('Watermelon Sugar'))
+        cache.get(Videos('Watermelon Sugar', region='FR'))
+        self.assertEqual(len(cache), 1)
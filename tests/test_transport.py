@@ -0,0 +1,274 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from requests import Session
+
+from tests.helpers import LocalServer, create_pages, create_responses
+from youtube_searcher.search import Videos
+from youtube_searcher.transport import (AsyncSingleFlight, SingleFlight,
+                                        Transfer, TransferStats, Transport)
+
+
+def slow_response(response, delay: float = 0.2):
+    def send(*args, **kwargs):
+        time.sleep(delay)
+        return response
+    return send
+
+
+class TestSingleFlight(TestCase):
+    def test_coalesce(self):
+        single_flight = SingleFlight()
+        barrier = threading.Barrier(5)
+        calls = []
+
+        def func():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'value': 1}
+
+        def worker():
+            barrier.wait()
+            return single_flight.do('key', func)
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            results = list(executor.map(lambda _: worker(), range(5)))
+
+        self.assertEqual(len(calls), 1)
+        for result in results:
+            self.assertIs(result, results[0])
+        self.assertDictEqual(single_flight.calls, {})
+
+    def test_different_keys(self):
+        single_flight = SingleFlight()
+        self.assertEqual(single_flight.do('a', lambda: 1), 1)
+        self.assertEqual(single_flight.do('b', lambda: 2), 2)
+
+
+class TestAsyncSingleFlight(TestCase):
+    def test_leader_cancelled(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return {'value': 1}
+
+        async def main():
+            leader = asyncio.ensure_future(single_flight.do('key', func))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(single_flight.do('key', func))
+            await asyncio.sleep(0.01)
+
+            leader.cancel()
+            result = await waiter
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return result
+
+        self.assertDictEqual(asyncio.run(main()), {'value': 1})
+        self.assertEqual(len(calls), 1)
+        self.assertDictEqual(single_flight.calls, {})
+
+    def test_all_cancelled(self):
+        single_flight = AsyncSingleFlight()
+        cancelled = []
+
+        async def func():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        async def main():
+            callers = [
+                asyncio.ensure_future(single_flight.do('key', func))
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            # Let the call process its cancellation
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        self.assertEqual(len(cancelled), 1)
+        self.assertDictEqual(single_flight.calls, {})
+        self.assertEqual(len(single_flight.waiters), 0)
+
+
+@patch.object(Session, 'send')
+class TestTransport(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.response = create_responses(create_pages(1))[0]
+
+    def test_threaded_coalescing(self, mock_send: Mock):
+        mock_send.side_effect = slow_response(self.response)
+
+        transport = Transport()
+        barrier = threading.Barrier(8)
+
+        def worker(_):
+            instance = Videos('Watermelon Sugar')
+            barrier.wait()
+            return transport.send(instance)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(worker, range(8)))
+
+        self.assertEqual(mock_send.call_count, 1)
+        for result in results:
+            self.assertIs(result, results[0])
+
+    def test_different_queries(self, mock_send: Mock):
+        mock_send.side_effect = slow_response(self.response, delay=0.1)
+
+        transport = Transport()
+        barrier = threading.Barrier(2)
+
+        def worker(query):
+            instance = Videos(query)
+            barrier.wait()
+            return transport.send(instance)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(worker, ['Watermelon Sugar', 'As It Was']))
+
+        self.assertEqual(mock_send.call_count, 2)
+
+    def test_timeout(self, mock_send: Mock):
+        mock_send.return_value = self.response
+        transport = Transport(coalesce=False, timeout=10)
+
+        transport.send(Videos('Watermelon Sugar'))
+        self.assertEqual(mock_send.call_args.kwargs['timeout'], 10)
+
+        transport.send(Videos('Watermelon Sugar', timeout=2))
+        self.assertEqual(mock_send.call_args.kwargs['timeout'], 2)
+
+    def test_threaded_errors(self, mock_send: Mock):
+        def send(*args, **kwargs):
+            time.sleep(0.2)
+            raise ConnectionError('Connection refused')
+        mock_send.side_effect = send
+
+        transport = Transport()
+        barrier = threading.Barrier(4)
+
+        def worker(_):
+            instance = Videos('Watermelon Sugar')
+            barrier.wait()
+            try:
+                transport.send(instance)
+            except ConnectionError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(worker, range(4)))
+
+        self.assertEqual(mock_send.call_count, 1)
+        for result in results:
+            self.assertIsInstance(result, ConnectionError)
+
+    def test_async_coalescing(self, mock_send: Mock):
+        mock_send.side_effect = slow_response(self.response)
+
+        transport = Transport()
+
+        async def main():
+            instances = [Videos('Watermelon Sugar') for _ in range(8)]
+            return await asyncio.gather(*[transport.asend(x) for x in instances])
+
+        results = asyncio.run(main())
+        self.assertEqual(mock_send.call_count, 1)
+        for result in results:
+            self.assertIs(result, results[0])
+
+    def test_async_errors(self, mock_send: Mock):
+        mock_send.side_effect = ConnectionError('Connection refused')
+
+        transport = Transport()
+
+        async def main():
+            instances = [Videos('Watermelon Sugar') for _ in range(4)]
+            return await asyncio.gather(
+                *[transport.asend(x) for x in instances],
+                return_exceptions=True
+            )
+
+        results = asyncio.run(main())
+        self.assertEqual(mock_send.call_count, 1)
+        for result in results:
+            self.assertIsInstance(result, ConnectionError)
+
+    def test_async_iteration(self, mock_send: Mock):
+        mock_send.side_effect = create_responses(create_pages(2))
+
+        instance = Videos('Watermelon Sugar', limit=None)
+        items = asyncio.run(instance.objects.aall())
+        self.assertEqual(len(items), 38)
+
+
+class TestTransferStats(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.page = create_pages(1)[0]
+        cls.body = json.dumps(cls.page, indent=2).encode('utf-8')
+
+    def setUp(self):
+        self.server = LocalServer(body=self.body, compress=True)
+
+        class LocalVideos(Videos):
+            base_url = f'{self.server.url}/youtubei/v1/search'
+
+        self.search_class = LocalVideos
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_compressed_response(self):
+        transport = Transport(coalesce=False, chunk_size=1024)
+        instance = self.search_class('Watermelon Sugar')
+
+        response_data = transport.send(instance)
+        self.assertDictEqual(response_data, self.page)
+
+        request = self.server.requests[0]
+        self.assertIn('prettyPrint=false', request['url'])
+        self.assertIn('gzip', request['headers']['Accept-Encoding'])
+
+        transfer = transport.stats.transfers[0]
+        self.assertEqual(transfer.content_encoding, 'gzip')
+        self.assertEqual(transfer.decoded_bytes, len(self.body))
+        self.assertEqual(transfer.wire_bytes, len(gzip.compress(self.body)))
+        self.assertGreater(transport.stats.compression_ratio, 1)
+
+        # The connection is returned to the pool
+        # once the body was read
+        transport.send(self.search_class('As It Was'))
+        self.assertEqual(transport.stats.requests, 2)
+
+    def test_summary(self):
+        stats = TransferStats(maxlen=1)
+        self.assertIsNone(stats.compression_ratio)
+
+        stats.record(Transfer('https://youtube.com', 100, 1000, 'gzip'))
+        stats.record(Transfer('https://youtube.com', 500, 500, 'identity'))
+        self.assertEqual(len(stats.transfers), 1)
+        self.assertDictEqual(stats.summary(), {
+            'requests': 2,
+            'wire_bytes': 600,
+            'decoded_bytes': 1500,
+            'compression_ratio': 2.5,
+            'encodings': {'gzip': 1, 'identity': 1}
+        })
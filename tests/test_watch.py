@@ -0,0 +1,203 @@
+import copy
+import threading
+from unittest import TestCase
+
+from tests.helpers import create_pages
+from youtube_searcher.constants import CONTENT_PATH, SearchModes
+from youtube_searcher.transport import Transport
+from youtube_searcher.watch import Watcher
+
+PAGE = create_pages(1)[0]
+
+
+def remove_videos(page: dict, count: int):
+    """Returns a copy of the page without
+    its first `count` videos"""
+    page = copy.deepcopy(page)
+    items = page
+    for key in CONTENT_PATH:
+        items = items[key]
+
+    contents = items[0]['itemSectionRenderer']['contents']
+    indexes = [i for i, x in enumerate(contents) if 'videoRenderer' in x]
+    for index in reversed(indexes[:count]):
+        del contents[index]
+    return page
+
+
+class SequenceTransport(Transport):
+    """Returns the next response of the sequence
+    for each request of a query"""
+
+    def __init__(self, responses: dict[str, list]):
+        super().__init__(coalesce=False)
+        self.responses = responses
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def fetch(self, search_instance):
+        with self.lock:
+            self.requests.append(search_instance)
+            response = self.responses[search_instance.query].pop(0)
+
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestWatcher(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.smaller_page = remove_videos(PAGE, 2)
+
+    def create_watcher(self, responses):
+        self.transport = SequenceTransport(responses)
+        return Watcher(transport=self.transport, clock=self.clock, seed=1)
+
+    def test_events(self):
+        watcher = self.create_watcher({
+            'Kendall': [PAGE, PAGE, self.smaller_page, PAGE]
+        })
+        watcher.add('Kendall', interval=10, jitter=0)
+
+        events = watcher.run_pending()
+        self.assertEqual(len(events), 19)
+        self.assertTrue(all(x.kind == 'appeared' for x in events))
+        self.assertIsNotNone(events[0].video)
+
+        # The query is not due yet
+        self.clock.now = 5
+        self.assertListEqual(watcher.run_pending(), [])
+
+        self.clock.now = 10
+        self.assertListEqual(watcher.run_pending(), [])
+
+        self.clock.now = 30
+        events = watcher.run_pending()
+        self.assertListEqual([x.kind for x in events], ['disappeared'] * 2)
+        self.assertIsNone(events[0].video)
+
+        self.clock.now = 40
+        events = watcher.run_pending()
+        self.assertListEqual([x.kind for x in events], ['appeared'] * 2)
+        self.assertEqual(len(self.transport.requests), 4)
+
+    def test_backoff(self):
+        watcher = self.create_watcher({'Kendall': [PAGE] * 5})
+        watched = watcher.add('Kendall', interval=10, jitter=0, max_interval=30)
+
+        intervals = []
+        for _ in range(5):
+            self.clock.now = watched.next_run
+            watcher.run_pending()
+            intervals.append(watched.current_interval)
+
+        # The first poll changes the results
+        self.assertListEqual(intervals, [10, 20, 30, 30, 30])
+        self.assertEqual(watched.polls, 5)
+        self.assertEqual(watched.changes, 1)
+
+    def test_reset_on_change(self):
+        watcher = self.create_watcher({
+            'Kendall': [PAGE, PAGE, PAGE, self.smaller_page]
+        })
+        watched = watcher.add('Kendall', interval=10, jitter=0)
+
+        for _ in range(4):
+            self.clock.now = watched.next_run
+            watcher.run_pending()
+        self.assertEqual(watched.current_interval, 10)
+
+    def test_errors(self):
+        watcher = self.create_watcher({
+            'Kendall': [ConnectionError('Connection refused'), PAGE]
+        })
+        watched = watcher.add('Kendall', interval=10, jitter=0)
+
+        self.assertListEqual(watcher.run_pending(), [])
+        self.assertIsNotNone(watched.last_error)
+        self.assertEqual(watched.current_interval, 20)
+
+        self.clock.now = watched.next_run
+        self.assertEqual(len(watcher.run_pending()), 19)
+        self.assertIsNone(watched.last_error)
+
+    def test_jitter(self):
+        watcher = self.create_watcher({})
+        watched = watcher.add('Kendall', interval=100, jitter=0.2)
+
+        delays = [watcher.next_delay(watched) for _ in range(50)]
+        self.assertTrue(all(80 <= x <= 120 for x in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_many_queries(self):
+        watcher = self.create_watcher({
+            'Kendall': [PAGE],
+            'Kylie': [self.smaller_page],
+            'Live': [PAGE]
+        })
+        watcher.add('Kendall', interval=10)
+        watcher.add('Kylie', interval=60)
+        watcher.add('Live', interval=5, livestreams=True)
+        watcher.add('Removed', interval=5)
+        watcher.remove('Removed')
+
+        events = watcher.run_pending()
+        self.assertEqual(len(events), 19 + 17 + 19)
+        self.assertEqual(len(watcher), 3)
+
+        search_preferences = {
+            x.query: x.search_preferences
+            for x in self.transport.requests
+        }
+        self.assertEqual(search_preferences['Live'], SearchModes.livestreams)
+        self.assertEqual(search_preferences['Kendall'], SearchModes.videos)
+
+        # The next query to poll is the livestream
+        self.assertLessEqual(watcher.time_until_next(), 5.5)
+
+    def test_watch(self):
+        watcher = self.create_watcher({'Kendall': [PAGE]})
+        watcher.add('Kendall', interval=10)
+
+        stop_event = threading.Event()
+        events = []
+        for event in watcher.watch(stop_event):
+            events.append(event)
+            stop_event.set()
+        self.assertEqual(len(events), 19)
+
+    def test_executor_reused(self):
+        watcher = self.create_watcher({'Kendall': [PAGE, PAGE], 'Kylie': [PAGE, PAGE]})
+        watcher.add('Kendall', interval=10, jitter=0)
+        watcher.add('Kylie', interval=10, jitter=0)
+
+        with watcher:
+            watcher.run_pending()
+            executor = watcher.executor
+            threads = set(executor._threads)
+
+            self.clock.now = 10
+            watcher.run_pending()
+            self.assertIs(watcher.executor, executor)
+            # The threads of the first tick are reused
+            self.assertLessEqual(threads, set(executor._threads))
+            self.assertEqual(len(self.transport.requests), 4)
+        self.assertIsNone(watcher.executor)
+
+    def test_watch_closes_executor(self):
+        watcher = self.create_watcher({'Kendall': [PAGE]})
+        watcher.add('Kendall', interval=10)
+
+        stop_event = threading.Event()
+        for _ in watcher.watch(stop_event):
+            stop_event.set()
+        self.assertIsNone(watcher.executor)
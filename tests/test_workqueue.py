@@ -0,0 +1,206 @@
+import contextlib
+import multiprocessing
+import pathlib
+import sqlite3
+import tempfile
+from unittest import TestCase, skipUnless
+
+from tests.helpers import create_pages
+from youtube_searcher.sinks import SQLiteSink
+from youtube_searcher.transport import Transport
+from youtube_searcher.workqueue import (LeaseExpiredError, SQLiteQueueBackend,
+                                        Task, Worker)
+
+PAGES = create_pages(3)
+
+
+class PagesTransport(Transport):
+    """Returns the test pages based on the continuation
+    token of the search instead of sending requests"""
+
+    def __init__(self, pages: list[dict] = PAGES, error: bool = False):
+        super().__init__(coalesce=False)
+        self.pages = pages
+        self.error = error
+        self.calls = 0
+
+    def fetch(self, search_instance):
+        self.calls = self.calls + 1
+        if self.error:
+            raise ConnectionError('Connection refused')
+
+        token = search_instance.continuation_key
+        if token is None:
+            return self.pages[0]
+        return self.pages[int(token.split('_')[-1]) + 1]
+
+
+def run_worker(path: str):
+    backend = SQLiteQueueBackend(path)
+    Worker(backend, transport=PagesTransport()).run(poll_interval=0.05)
+
+
+class TestSQLiteQueueBackend(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name).joinpath('crawl.sqlite')
+        self.backend = SQLiteQueueBackend(self.path, max_attempts=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_put(self):
+        count = self.backend.put([
+            Task.videos('Kendall'),
+            Task.videos('Kendall'),
+            Task.channel('UC1')
+        ])
+        self.assertEqual(count, 2)
+        self.assertEqual(self.backend.put([Task.videos('Kendall')]), 0)
+        self.assertEqual(self.backend.stats()['pending'], 2)
+
+    def test_lease(self):
+        self.backend.put([Task.videos('Kendall')])
+
+        task = self.backend.lease(visibility_timeout=60)
+        self.assertEqual(task.query, 'Kendall')
+        self.assertEqual(task.attempts, 1)
+        self.assertIsNotNone(task.lease_token)
+
+        # The task is invisible while it is leased
+        self.assertIsNone(self.backend.lease())
+
+    def test_expired_lease(self):
+        self.backend.put([Task.videos('Kendall')])
+
+        task1 = self.backend.lease(visibility_timeout=0)
+        task2 = self.backend.lease(visibility_timeout=60)
+        self.assertEqual(task1.task_id, task2.task_id)
+        self.assertEqual(task2.attempts, 2)
+
+        # The first worker lost its lease and cannot
+        # commit its results anymore
+        with self.assertRaises(LeaseExpiredError):
+            self.backend.complete(task1, [])
+
+        self.backend.complete(task2, [])
+        self.assertEqual(self.backend.stats()['done'], 1)
+
+    def test_max_attempts(self):
+        self.backend.put([Task.videos('Kendall')])
+
+        for _ in range(2):
+            task = self.backend.lease()
+            self.backend.fail(task, 'Error')
+
+        self.assertIsNone(self.backend.lease())
+        self.assertEqual(self.backend.stats()['failed'], 1)
+
+    def test_exactly_once_results(self):
+        self.backend.put([Task.videos('Kendall'), Task.videos('Jenner')])
+
+        task = self.backend.lease()
+        worker = Worker(self.backend, transport=PagesTransport())
+        results, _ = worker.process(task)
+        self.assertEqual(self.backend.complete(task, results), 19)
+
+        task = self.backend.lease()
+        results, _ = worker.process(task)
+        self.assertEqual(self.backend.complete(task, results), 0)
+
+        self.assertEqual(self.backend.stats()['results'], 19)
+
+
+class TestWorker(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.directory.name).joinpath('crawl.sqlite')
+        self.backend = SQLiteQueueBackend(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_continuations(self):
+        self.backend.put([Task.videos('Kendall')])
+
+        transport = PagesTransport()
+        worker = Worker(self.backend, transport=transport)
+        self.assertEqual(worker.run(), 3)
+        self.assertEqual(transport.calls, 3)
+
+        stats = self.backend.stats()
+        self.assertEqual(stats['done'], 3)
+        self.assertEqual(stats['results'], 57)
+
+        items = self.backend.values_list('video_id')
+        self.assertEqual(len({x['video_id'] for x in items}), 57)
+
+    def test_results_schema(self):
+        sink_path = pathlib.Path(self.directory.name).joinpath('videos.sqlite')
+        SQLiteSink(sink_path).close()
+
+        def table_info(path, table_name):
+            with contextlib.closing(sqlite3.connect(path)) as connection:
+                return connection.execute(f'PRAGMA table_info("{table_name}")').fetchall()
+
+        # The results are stored like the rows of a sink
+        self.assertListEqual(
+            table_info(self.path, 'results'),
+            table_info(sink_path, 'videos')
+        )
+
+        with self.assertRaises(ValueError):
+            self.backend.values_list('unknown')
+
+    def test_max_pages(self):
+        self.backend.put([Task.videos('Kendall')])
+
+        worker = Worker(self.backend, transport=PagesTransport(), max_pages=2)
+        self.assertEqual(worker.run(), 2)
+        self.assertEqual(self.backend.stats()['results'], 38)
+
+    def test_failure(self):
+        self.backend.put([Task.videos('Kendall')])
+
+        worker = Worker(
+            self.backend,
+            transport=PagesTransport(error=True),
+            retry_delay=60
+        )
+        self.assertTrue(worker.run_once())
+        self.assertEqual(worker.failed, 1)
+
+        # The task is retried once the delay has passed
+        self.assertFalse(worker.run_once())
+        self.assertEqual(self.backend.stats()['pending'], 1)
+
+    @skipUnless(
+        'fork' in multiprocessing.get_all_start_methods(),
+        'Requires the fork start method'
+    )
+    def test_multiple_processes(self):
+        self.backend.put([
+            Task.videos('Kendall'),
+            Task.videos('Jenner'),
+            Task.videos('Kylie')
+        ])
+
+        context = multiprocessing.get_context('fork')
+        processes = [
+            context.Process(target=run_worker, args=(str(self.path),))
+            for _ in range(3)
+        ]
+        for process in processes:
+            process.start()
+
+        for process in processes:
+            process.join(timeout=30)
+            self.assertEqual(process.exitcode, 0)
+
+        stats = self.backend.stats()
+        self.assertEqual(stats['done'], 9)
+        self.assertEqual(stats['pending'], 0)
+
+        # The three queries return the same videos which
+        # are only committed once
+        self.assertEqual(stats['results'], 57)
@@ -0,0 +1,267 @@
+import argparse
+import csv
+import dataclasses
+import json
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional, TextIO
+
+from youtube_searcher.models.videos import LazyThumbnails, VideoModel
+from youtube_searcher.query import resolve_path
+from youtube_searcher.search import ChannelVideos, Videos
+
+DEFAULT_FIELDS = [
+    'video_id',
+    'title',
+    'channel__channel_id',
+    'channel__title',
+    'duration',
+    'duration_seconds',
+    'view_count_text',
+    'view_count',
+    'publication_text',
+    'published_at',
+    'youtube_link'
+]
+
+
+class Statistics:
+    """Collects the number of results, the errors and the
+    latency of each query during a run"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.results = 0
+        self.errors: list[tuple[str, str]] = []
+        # The error raised while reading the queries
+        # which stops the run before the end of the input
+        self.input_error: Optional[str] = None
+        self.latencies: list[float] = []
+
+    def __repr__(self):
+        return f'<Statistics [{self.queries}]>'
+
+    @staticmethod
+    def percentile(values: list[float], percent: float):
+        if not values:
+            return 0
+        values = sorted(values)
+        index = round(percent / 100 * (len(values) - 1))
+        return values[index]
+
+    def summary(self) -> str:
+        elapsed = time.perf_counter() - self.start
+        lines = [
+            f'Queries: {self.queries} ({len(self.errors)} errors)',
+            f'Results: {self.results}',
+            f'Elapsed: {elapsed:.2f}s',
+            f'Throughput: {self.results / elapsed:.1f} results/s, '
+            f'{self.queries / elapsed:.2f} queries/s',
+            'Latency: p50={:.2f}s p95={:.2f}s max={:.2f}s'.format(
+                self.percentile(self.latencies, 50),
+                self.percentile(self.latencies, 95),
+                max(self.latencies, default=0)
+            )
+        ]
+
+        for query, error in self.errors:
+            lines.append(f'Error: {query}: {error}')
+
+        if self.input_error is not None:
+            lines.append(f'Input error: {self.input_error}')
+        return '\n'.join(lines)
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.errors) or self.input_error is not None
+
+
+def read_queries(stream: TextIO) -> Iterator[str]:
+    for line in stream:
+        line = line.strip()
+        if line and not line.startswith('#'):
+            yield line
+
+
+def create_search(line: str, args: argparse.Namespace):
+    kwargs = {
+        'limit': args.limit,
+        'language': args.language,
+        'region': args.region
+    }
+
+    if args.channels:
+        # Lines are either "channel_id" or
+        # "channel_id<tab>query"
+        channel_id, _, query = line.partition('\t')
+        return ChannelVideos(query, channel_id.strip(), **kwargs)
+    return Videos(line, **kwargs)
+
+
+def run_query(line: str, args: argparse.Namespace, results: queue.Queue):
+    start = time.perf_counter()
+
+    try:
+        instance = create_search(line, args)
+        for video in instance.objects.iterator(chunk_size=args.chunk_size):
+            row = {'query': line}
+            for field in args.fields:
+                row[field] = resolve_path(video, field)
+            results.put(('row', row))
+    except Exception as e:
+        results.put(('error', (line, e)))
+    finally:
+        results.put(('done', time.perf_counter() - start))
+
+
+def json_default(value: object):
+    """Converts the values that cannot be encoded by `json`"""
+    if isinstance(value, LazyThumbnails):
+        return value.to_list()
+
+    if isinstance(value, VideoModel):
+        return value.to_dict()
+
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+class Writer:
+    def __init__(self, stream: TextIO, output_format: str, fields: list[str]):
+        self.stream = stream
+        self.output_format = output_format
+        self.writer = None
+
+        if output_format == 'csv':
+            self.writer = csv.DictWriter(
+                stream,
+                fieldnames=['query', *fields],
+                lineterminator='\n'
+            )
+            self.writer.writeheader()
+
+    def write(self, row: dict[str, str]):
+        if self.writer is not None:
+            # Nested values are stored as JSON in their cell
+            self.writer.writerow({
+                key: json.dumps(value, default=json_default)
+                if isinstance(value, (LazyThumbnails, list, dict)) else value
+                for key, value in row.items()
+            })
+        else:
+            self.stream.write(json.dumps(row, default=json_default) + '\n')
+
+
+def create_parser():
+    parser = argparse.ArgumentParser(
+        prog='youtube-searcher',
+        description=(
+            'Runs a batch of YouTube searches and streams the '
+            'results to stdout as NDJSON or CSV'
+        )
+    )
+    parser.add_argument(
+        'input',
+        nargs='?',
+        type=argparse.FileType('r', encoding='utf-8'),
+        default='-',
+        help='File containing one query per line (default: stdin)'
+    )
+    parser.add_argument(
+        '--channels',
+        action='store_true',
+        help='Lines are channel IDs optionally followed by a tab and a query'
+    )
+    parser.add_argument('-c', '--concurrency', type=int, default=4)
+    parser.add_argument('-l', '--limit', type=int, default=20)
+    parser.add_argument('--language', default='en')
+    parser.add_argument('--region', default='US')
+    parser.add_argument(
+        '-f',
+        '--format',
+        choices=['ndjson', 'csv'],
+        default='ndjson'
+    )
+    parser.add_argument(
+        '--fields',
+        type=lambda value: value.split(','),
+        default=DEFAULT_FIELDS,
+        help='Comma separated list of fields e.g. video_id,channel__channel_id'
+    )
+    parser.add_argument('--chunk-size', type=int, default=50)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None):
+    parser = create_parser()
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error('concurrency should be greater than 0')
+
+    statistics = Statistics()
+    writer = Writer(sys.stdout, args.format, args.fields)
+    # The queue is bounded so that slow consumers
+    # apply backpressure on the workers
+    results = queue.Queue(maxsize=1000)
+
+    def submit_queries(executor: ThreadPoolExecutor, pending: threading.Semaphore):
+        try:
+            for line in read_queries(args.input):
+                pending.acquire()
+                statistics.queries = statistics.queries + 1
+                future = executor.submit(run_query, line, args, results)
+                future.add_done_callback(lambda _: pending.release())
+        except Exception as e:
+            results.put(('input_error', e))
+        finally:
+            results.put(('end', None))
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        pending = threading.Semaphore(args.concurrency * 2)
+        producer = threading.Thread(
+            target=submit_queries,
+            args=(executor, pending),
+            daemon=True
+        )
+        producer.start()
+
+        completed = 0
+        submitted_all = False
+
+        while not submitted_all or completed < statistics.queries:
+            kind, value = results.get()
+
+            if kind == 'row':
+                writer.write(value)
+                statistics.results = statistics.results + 1
+
+                # Flush as soon as there are no pending rows
+                # so that the results are streamed
+                if results.empty():
+                    sys.stdout.flush()
+            elif kind == 'error':
+                query, error = value
+                statistics.errors.append((query, repr(error)))
+            elif kind == 'input_error':
+                statistics.input_error = repr(value)
+            elif kind == 'done':
+                completed = completed + 1
+                statistics.latencies.append(value)
+            elif kind == 'end':
+                submitted_all = True
+
+        producer.join()
+
+    sys.stdout.flush()
+    print(statistics.summary(), file=sys.stderr)
+    return 1 if statistics.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
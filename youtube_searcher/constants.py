@@ -1,5 +1,9 @@
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/70.0.3538.77 Safari/537.36'
 
+CLIENT_NAME = 'WEB'
+
+CLIENT_VERSION = '2.20210224.06.00'
+
 VIDEO_ELEMENT_KEY = 'videoRenderer'
 
 CHANNEL_ELEMENT_KEY = 'channelRenderer'
@@ -41,11 +45,31 @@ FALLBACK_CONTENT_PATH = [
     'primaryContents', 'richGridRenderer', 'contents'
 ]
 
+BROWSE_CONTENT_PATH = [
+    'contents', 'twoColumnBrowseResultsRenderer', 'tabs', -1,
+    'tabRenderer', 'content', 'sectionListRenderer', 'contents'
+]
+
+BROWSE_EXPANDABLE_CONTENT_PATH = [
+    'contents', 'twoColumnBrowseResultsRenderer', 'tabs', -1,
+    'expandableTabRenderer', 'content', 'sectionListRenderer', 'contents'
+]
+
+BROWSE_RICH_GRID_CONTENT_PATH = [
+    'contents', 'twoColumnBrowseResultsRenderer', 'tabs', -1,
+    'tabRenderer', 'content', 'richGridRenderer', 'contents'
+]
+
 CONTINUATION_CONTENT_PATH = [
     'onResponseReceivedCommands',
     0, 'appendContinuationItemsAction', 'continuationItems'
 ]
 
+BROWSE_CONTINUATION_CONTENT_PATH = [
+    'onResponseReceivedActions',
+    0, 'appendContinuationItemsAction', 'continuationItems'
+]
+
 CONTINUATION_KEY_PATH = [
     'continuationItemRenderer',
     'continuationEndpoint', 'continuationCommand', 'token'
@@ -0,0 +1,174 @@
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from youtube_searcher.constants import (CONTINUATION_ITEM_KEY,
+                                        CONTINUATION_KEY_PATH,
+                                        ITEM_SECTION_KEY, RICH_ITEM_KEY,
+                                        VIDEO_ELEMENT_KEY)
+from youtube_searcher.models.videos import LazyThumbnails, SimpleChannelModel
+from youtube_searcher.query import Query
+from youtube_searcher.typings import B, D
+
+Handler = Callable[[D, B], Optional[D]]
+
+
+class Accessor:
+    """`Accessor` precompiles a `__` path in order to quickly
+    get a value nested in a dictionnary. Contrarily to `QueryDict`,
+    a missing key does not raise or print a warning but returns
+    the default value. Numeric keys are used as list indexes
+
+    >>> accessor = Accessor('title__runs__0__text')
+    ... accessor({'title': {'runs': [{'text': 'Ep 51'}]}})
+    ... 'Ep 51'
+    """
+
+    def __init__(self, path: Union[str, list[Union[str, int]]], default=None):
+        if isinstance(path, str):
+            path = path.split('__')
+
+        self.keys = tuple(
+            int(key) if isinstance(key, str) and key.isdigit() else key
+            for key in path
+        )
+        self.default = default
+
+    def __repr__(self):
+        path = '__'.join(str(key) for key in self.keys)
+        return f'<Accessor [{path}]>'
+
+    def __call__(self, data: D):
+        value = data
+        try:
+            for key in self.keys:
+                value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return self.default
+        return value
+
+
+class Extractor:
+    """`Extractor` walks the items of a page of results once and
+    sends each item to the handler registered for its renderer key.
+    Container renderers (e.g. `itemSectionRenderer`) are expanded
+    in the same pass and the continuation token is stored on the
+    search instance when it is encountered. Items for which no
+    handler was registered are skipped
+
+    >>> extractor = Extractor()
+    ... @extractor.register('videoRenderer')
+    ... def video_handler(value, search):
+    ...     return {'video_id': value['videoId']}
+    """
+
+    continuation_key = Accessor(CONTINUATION_KEY_PATH[1:])
+
+    def __init__(self, handlers: Optional[dict[str, Handler]] = None):
+        self.handlers: dict[str, Handler] = dict(handlers or {})
+        # Renderers that wrap other renderers and the
+        # key under which the wrapped items are stored
+        self.containers: dict[str, str] = {
+            ITEM_SECTION_KEY: 'contents',
+            RICH_ITEM_KEY: 'content'
+        }
+
+    def __repr__(self):
+        return f'<Extractor {list(self.handlers)}>'
+
+    def __contains__(self, renderer_key: str):
+        return renderer_key in self.handlers
+
+    def register(self, renderer_key: str, handler: Optional[Handler] = None):
+        """Registers a handler for the given renderer key. Can
+        be used directly or as a decorator"""
+        if handler is None:
+            def decorator(func: Handler):
+                self.handlers[renderer_key] = func
+                return func
+            return decorator
+
+        self.handlers[renderer_key] = handler
+        return handler
+
+    def copy(self):
+        """Returns a new extractor with the same handlers which
+        can be extended without modifying this one"""
+        instance = self.__class__(self.handlers)
+        instance.containers = self.containers.copy()
+        return instance
+
+    def extract(self, items: Union[Query, Iterable[D]], search_instance: B) -> Iterator[D]:
+        if isinstance(items, Query):
+            items = items.cache
+
+        if isinstance(items, dict):
+            items = [items]
+
+        handlers = self.handlers
+        containers = self.containers
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+
+            for renderer_key, value in item.items():
+                handler = handlers.get(renderer_key)
+                if handler is not None:
+                    result = handler(value, search_instance)
+                    if result is not None:
+                        yield result
+                elif renderer_key in containers:
+                    children = value.get(containers[renderer_key])
+                    if children is not None:
+                        yield from self.extract(children, search_instance)
+                elif renderer_key == CONTINUATION_ITEM_KEY:
+                    token = self.continuation_key(value)
+                    if token is not None:
+                        search_instance.continuation_key = token
+
+
+video_id = Accessor('videoId')
+video_title = Accessor('title__runs__0__text')
+video_thumbnails = Accessor('thumbnail__thumbnails', default=[])
+video_publication_text = Accessor('publishedTimeText__simpleText')
+video_duration = Accessor('lengthText__simpleText')
+video_view_count_text = Accessor('viewCountText__simpleText')
+video_search_key = Accessor('searchVideoResultEntityKey')
+video_description = Accessor('descriptionSnippet__runs__0__text')
+video_owner = Accessor('ownerText__runs__0')
+video_owner_title = Accessor('text')
+video_owner_id = Accessor('navigationEndpoint__browseEndpoint__browseId')
+
+
+def video_renderer_handler(value: D, search_instance: B) -> Optional[D]:
+    """Handler for `videoRenderer` items. Optional fields such
+    as `lengthText` (missing on livestreams and premieres) are
+    returned as None"""
+    identifier = video_id(value)
+    if identifier is None:
+        return None
+
+    owner = video_owner(value)
+    if owner is not None:
+        channel = SimpleChannelModel(
+            video_owner_id(owner), video_owner_title(owner))
+    elif getattr(search_instance, 'browse_id', None) is not None:
+        channel = SimpleChannelModel(search_instance.browse_id, None)
+    else:
+        channel = None
+
+    return {
+        'video_id': identifier,
+        'thumbnails': LazyThumbnails(video_thumbnails(value)),
+        'title': video_title(value),
+        'publication_text': video_publication_text(value),
+        'duration': video_duration(value),
+        'view_count_text': video_view_count_text(value),
+        'search_key': video_search_key(value),
+        'description': video_description(value),
+        'channel': channel,
+        'language': search_instance.language,
+        'fetched_at': search_instance.fetched_at
+    }
+
+
+video_extractor = Extractor({VIDEO_ELEMENT_KEY: video_renderer_handler})
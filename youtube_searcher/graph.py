@@ -0,0 +1,238 @@
+import hashlib
+import heapq
+import itertools
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, Optional
+
+from youtube_searcher.models.videos import VideoModel
+from youtube_searcher.search import ChannelVideos, Videos
+from youtube_searcher.transport import Transport
+
+
+class VisitedSet:
+    """A set of keys that only stores a 64-bit hash of each
+    key instead of the key itself. A hash collision, which is
+    very unlikely below billions of keys, makes the crawler
+    skip a node that was not visited
+
+    >>> visited = VisitedSet()
+    ... visited.add('channel:UCZFWPqqPkFlNwIxcpsLOwew')
+    ... True
+    """
+
+    def __init__(self):
+        self.hashes: set[int] = set()
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<VisitedSet [{len(self.hashes)}]>'
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __contains__(self, key: str):
+        return self.hash(key) in self.hashes
+
+    @staticmethod
+    def hash(key: str) -> int:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+
+    def add(self, key: str) -> bool:
+        """Adds the key and returns True if it
+        was not already in the set"""
+        value = self.hash(key)
+        with self.lock:
+            if value in self.hashes:
+                return False
+            self.hashes.add(value)
+            return True
+
+
+@dataclass(frozen=True)
+class Node:
+    """A node of the graph: a search query or a channel"""
+
+    kind: str
+    value: str
+    depth: int = 0
+    priority: int = 0
+
+    def __repr__(self):
+        return f'<Node [{self.kind}: {self.value}, depth={self.depth}]>'
+
+    @property
+    def key(self):
+        return f'{self.kind}:{self.value}'
+
+
+@dataclass
+class Expansion:
+    """The result of the expansion of a node: the videos that
+    were discovered for the first time and the channels that
+    were added to the frontier"""
+
+    node: Node
+    videos: list[VideoModel] = field(default_factory=list)
+    children: list[Node] = field(default_factory=list)
+    error: Optional[Exception] = None
+
+
+def view_count_priority(video: VideoModel) -> int:
+    return video.view_count or 0
+
+
+class GraphCrawler:
+    """Expands the graph query → videos → channels → channel videos
+    → channels... breadth-first. The nodes of a depth are expanded
+    before the nodes of the next depth and, within a depth, the
+    channels discovered through the most viewed videos are expanded
+    first. Each node is expanded at most once and the crawl stops
+    after `max_depth` levels or `budget` expansions. Expansions run
+    concurrently and share the same transport and therefore the
+    same connection pool
+
+    >>> crawler = GraphCrawler(queries=['Arlette pop the baloon'], max_depth=2, budget=50)
+    ... for expansion in crawler.crawl():
+    ...     print(expansion.node, len(expansion.videos))
+    """
+
+    def __init__(
+        self,
+        queries: Iterable[str] = (),
+        channels: Iterable[str] = (),
+        max_depth: int = 2,
+        budget: Optional[int] = 100,
+        max_workers: int = 4,
+        limit: int = 20,
+        transport: Optional[Transport] = None,
+        priority: Callable[[VideoModel], int] = view_count_priority,
+        **search_kwargs: str
+    ):
+        if max_workers < 1:
+            raise ValueError('Max workers should be greater than 0')
+
+        self.max_depth = max_depth
+        self.budget = budget
+        self.max_workers = max_workers
+        self.limit = limit
+        self.transport = transport
+        self.priority = priority
+        self.search_kwargs = search_kwargs
+
+        self.visited = VisitedSet()
+        self.seen_videos = VisitedSet()
+        self.frontier: list[tuple[int, int, int, Node]] = []
+        self.counter = itertools.count()
+        self.expanded = 0
+
+        for query in queries:
+            self.push(Node('query', query))
+
+        for channel_id in channels:
+            self.push(Node('channel', channel_id))
+
+    def __repr__(self):
+        return f'<GraphCrawler [expanded={self.expanded}, frontier={len(self.frontier)}]>'
+
+    def push(self, node: Node) -> bool:
+        """Adds the node to the frontier unless it was
+        already queued or expanded"""
+        if node.depth > self.max_depth:
+            return False
+
+        if not self.visited.add(node.key):
+            return False
+
+        entry = (node.depth, -node.priority, next(self.counter), node)
+        heapq.heappush(self.frontier, entry)
+        return True
+
+    def pop(self) -> Node:
+        return heapq.heappop(self.frontier)[-1]
+
+    def create_search(self, node: Node):
+        kwargs = self.search_kwargs | {'limit': self.limit}
+
+        if node.kind == 'query':
+            instance = Videos(node.value, **kwargs)
+        elif node.kind == 'channel':
+            instance = ChannelVideos('', node.value, **kwargs)
+        else:
+            raise ValueError(f'Unknown node kind: {node.kind}')
+
+        if self.transport is not None:
+            instance.transport = self.transport
+        return instance
+
+    def expand(self, node: Node) -> Expansion:
+        """Fetches the videos of the node and returns the
+        videos that were not seen before along with the
+        channels they belong to"""
+        instance = self.create_search(node)
+        expansion = Expansion(node)
+
+        priorities: dict[str, int] = {}
+        for video in instance.objects.iterator(chunk_size=self.limit):
+            if self.seen_videos.add(video.video_id):
+                expansion.videos.append(video)
+
+            channel_id = getattr(video.channel, 'channel_id', None)
+            if channel_id and channel_id != node.value:
+                priority = self.priority(video)
+                priorities[channel_id] = max(priorities.get(channel_id, priority), priority)
+
+        expansion.children = [
+            Node('channel', channel_id, node.depth + 1, priority)
+            for channel_id, priority in priorities.items()
+        ]
+        return expansion
+
+    def expand_safely(self, node: Node) -> Expansion:
+        try:
+            return self.expand(node)
+        except Exception as e:
+            return Expansion(node, error=e)
+
+    def has_budget(self) -> bool:
+        return self.budget is None or self.expanded < self.budget
+
+    def crawl(self) -> Iterator[Expansion]:
+        """Expands the frontier and yields each expansion as
+        soon as it completes. A node is only submitted once all
+        the nodes of the previous depths were expanded so that
+        their children can be ranked before they are expanded"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+
+            while running or (self.frontier and self.has_budget()):
+                running_depth = min(
+                    (node.depth for node in running.values()),
+                    default=None
+                )
+
+                while self.frontier and self.has_budget() and len(running) < self.max_workers:
+                    depth = self.frontier[0][0]
+                    if running_depth is not None and depth > running_depth:
+                        break
+
+                    node = self.pop()
+                    if running_depth is None:
+                        running_depth = node.depth
+                    self.expanded = self.expanded + 1
+                    running[executor.submit(self.expand_safely, node)] = node
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del running[future]
+                    expansion = future.result()
+
+                    # Only keep the children that were
+                    # not already queued or expanded
+                    expansion.children = [
+                        child for child in expansion.children
+                        if self.push(child)
+                    ]
+                    yield expansion
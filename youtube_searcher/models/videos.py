@@ -1,6 +1,13 @@
+import copy
 import datetime
-from dataclasses import dataclass, field
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, field
+from functools import cached_property
+from typing import Optional, Union
 
+from youtube_searcher.normalizers import (parse_duration,
+                                          parse_publication_text,
+                                          parse_view_count)
 from youtube_searcher.utils import create_channel_link, create_youtube_link
 
 
@@ -28,6 +35,93 @@ class ThumbnailModel:
     height: int = None
 
 
+class LazyThumbnails(Sequence):
+    """Wraps the raw list of thumbnails of a video. The
+    `ThumbnailModel` instances are only created when an
+    item is accessed and are then reused
+
+    >>> thumbnails = LazyThumbnails([{'url': '...', 'width': 360, 'height': 202}])
+    ... thumbnails[0]
+    ... ThumbnailModel(url='...', width=360, height=202)
+    """
+
+    __slots__ = ('raw', 'models')
+
+    def __init__(self, raw: Optional[list[Union[dict[str, str], ThumbnailModel]]] = None):
+        self.raw = raw if raw is not None else []
+        self.models: Optional[list[Optional[ThumbnailModel]]] = None
+
+    def __repr__(self):
+        return f'<LazyThumbnails [{len(self.raw)}]>'
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.raw)))]
+
+        item = self.raw[index]
+        if isinstance(item, ThumbnailModel):
+            return item
+
+        if self.models is None:
+            self.models = [None] * len(self.raw)
+
+        model = self.models[index]
+        if model is None:
+            model = self.models[index] = ThumbnailModel(**item)
+        return model
+
+    def __eq__(self, other: object):
+        if isinstance(other, (LazyThumbnails, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __deepcopy__(self, memo: dict):
+        return LazyThumbnails(copy.deepcopy(self.raw, memo))
+
+    def to_list(self) -> list[dict[str, str]]:
+        """Returns a copy of the thumbnails as a list of
+        dictionaries without building the models"""
+        return [
+            asdict(item) if isinstance(item, ThumbnailModel) else dict(item)
+            for item in self.raw
+        ]
+
+    @staticmethod
+    def get_width(item: Union[dict[str, str], ThumbnailModel]) -> int:
+        if isinstance(item, ThumbnailModel):
+            return item.width or 0
+        return item.get('width') or 0
+
+    def best(self, max_width: Optional[int] = None) -> Optional[ThumbnailModel]:
+        """Returns the widest thumbnail that is not wider than
+        `max_width` or the narrowest one when they are all wider.
+        Only the selected thumbnail is built"""
+        if not self.raw:
+            return None
+
+        best_index = narrowest_index = None
+        best_width = narrowest_width = 0
+
+        for index, item in enumerate(self.raw):
+            width = self.get_width(item)
+
+            if narrowest_index is None or width < narrowest_width:
+                narrowest_index, narrowest_width = index, width
+
+            if max_width is not None and width > max_width:
+                continue
+
+            if best_index is None or width > best_width:
+                best_index, best_width = index, width
+
+        if best_index is None:
+            best_index = narrowest_index
+        return self[best_index]
+
+
 @dataclass
 class VideoModel:
     title: str
@@ -35,20 +129,64 @@ class VideoModel:
     publication_text: str
     duration: str
     view_count_text: str
-    thumbnails: list[ThumbnailModel] = field(default_factory=list)
+    thumbnails: Sequence[ThumbnailModel] = field(default_factory=LazyThumbnails)
     search_key: str = None
     youtube_link: str = None
     youtube_channel: str = None
     channel: SimpleChannelModel = field(
         default_factory=lambda: SimpleChannelModel)
     description: str = None
+    language: str = 'en'
+    fetched_at: datetime.datetime = None
 
     def __post_init__(self):
         if self.video_id:
             self.youtube_link = create_youtube_link(self.video_id)
 
+        if not isinstance(self.thumbnails, LazyThumbnails):
+            self.thumbnails = LazyThumbnails(self.thumbnails)
+
     def __repr__(self):
         return f'<VideoModel [{self.title}]>'
 
+    def to_dict(self) -> dict[str, object]:
+        """Returns the fields of the video as plain values,
+        the thumbnails included, which can be dumped to JSON
+
+        >>> json.dumps(video.to_dict())
+        """
+        data = asdict(self)
+        data['thumbnails'] = self.thumbnails.to_list()
+        return data
+
+    def best_thumbnail(self, max_width: Optional[int] = None) -> Optional[ThumbnailModel]:
+        """Returns the widest thumbnail that fits in `max_width`
+        without building the other thumbnails
+
+        >>> video.best_thumbnail(max_width=400)
+        ... ThumbnailModel(url='...', width=360, height=202)
+        """
+        return self.thumbnails.best(max_width)
+
+    @cached_property
+    def view_count(self) -> Optional[int]:
+        """The number of views parsed from `view_count_text`"""
+        return parse_view_count(self.view_count_text, self.language)
+
+    @cached_property
+    def duration_seconds(self) -> Optional[int]:
+        """The duration of the video in seconds"""
+        return parse_duration(self.duration)
+
+    @cached_property
+    def published_at(self) -> Optional[datetime.datetime]:
+        """The approximate publication date relative to
+        the time at which the video was fetched"""
+        return parse_publication_text(
+            self.publication_text,
+            self.language,
+            self.fetched_at
+        )
+
     def __hash__(self):
         return hash((self.video_id,))
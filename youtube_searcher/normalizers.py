@@ -0,0 +1,270 @@
+import datetime
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Optional
+
+if TYPE_CHECKING:
+    import pandas
+
+
+@dataclass(frozen=True)
+class LocaleFormat:
+    """Describes how YouTube formats view counts and
+    publication times in a given language"""
+
+    decimal_separator: str = '.'
+    # Abbreviations used for large view counts
+    # e.g. 1.2M views or 1,2 Mio. Aufrufe
+    multipliers: dict[str, int] = field(default_factory=dict)
+    # The stems of the time units used in
+    # the publication text e.g. 3 weeks ago
+    units: dict[str, int] = field(default_factory=dict)
+
+
+MINUTE = 60
+
+HOUR = 60 * MINUTE
+
+DAY = 24 * HOUR
+
+WEEK = 7 * DAY
+
+MONTH = 30 * DAY
+
+YEAR = 365 * DAY
+
+LOCALES = {
+    'en': LocaleFormat(
+        '.',
+        {'k': 10**3, 'm': 10**6, 'b': 10**9},
+        {
+            'second': 1, 'minute': MINUTE, 'hour': HOUR, 'day': DAY,
+            'week': WEEK, 'month': MONTH, 'year': YEAR
+        }
+    ),
+    'fr': LocaleFormat(
+        ',',
+        {'k': 10**3, 'm': 10**6, 'md': 10**9},
+        {
+            'seconde': 1, 'minute': MINUTE, 'heure': HOUR, 'jour': DAY,
+            'semaine': WEEK, 'mois': MONTH, 'an': YEAR
+        }
+    ),
+    'es': LocaleFormat(
+        ',',
+        {'k': 10**3, 'mil': 10**3, 'm': 10**6, 'mm': 10**9},
+        {
+            'segundo': 1, 'minuto': MINUTE, 'hora': HOUR, 'día': DAY,
+            'dia': DAY, 'semana': WEEK, 'mes': MONTH, 'año': YEAR
+        }
+    ),
+    'de': LocaleFormat(
+        ',',
+        {'tsd': 10**3, 'mio': 10**6, 'mrd': 10**9},
+        {
+            'sekunde': 1, 'minute': MINUTE, 'stunde': HOUR, 'tag': DAY,
+            'woche': WEEK, 'monat': MONTH, 'jahr': YEAR
+        }
+    ),
+    'pt': LocaleFormat(
+        ',',
+        {'mil': 10**3, 'mi': 10**6, 'bi': 10**9},
+        {
+            'segundo': 1, 'minuto': MINUTE, 'hora': HOUR, 'dia': DAY,
+            'semana': WEEK, 'mês': MONTH, 'mes': MONTH, 'ano': YEAR
+        }
+    )
+}
+
+VIEW_COUNT_REGEX = re.compile(r'(\d[\d.,\s]*)\s*([^\W\d_]*)')
+
+DURATION_REGEX = re.compile(r'^(?:(\d+):)?(\d+):(\d+)$')
+
+PUBLICATION_REGEX = re.compile(r'(\d+)\s*([^\W\d_]+)')
+
+
+def get_locale(language: Optional[str] = 'en') -> LocaleFormat:
+    """Returns the format for the given language e.g. `fr`
+    or `fr-FR`. English is used for unknown languages"""
+    if not language:
+        return LOCALES['en']
+    key = language.lower().replace('_', '-').split('-')[0]
+    return LOCALES.get(key, LOCALES['en'])
+
+
+def get_unit_seconds(unit: str, locale: LocaleFormat) -> Optional[int]:
+    unit = unit.lower()
+    # Longest stems first so that "minute" is not
+    # matched by a shorter stem e.g. "mi"
+    for stem in sorted(locale.units, key=len, reverse=True):
+        if unit.startswith(stem):
+            return locale.units[stem]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def parse_view_count(text: Optional[str], language: Optional[str] = 'en') -> Optional[int]:
+    """Returns the number of views from the view count text
+
+    >>> parse_view_count('1,234,567 views')
+    ... 1234567
+    >>> parse_view_count('1,2 M de vues', 'fr')
+    ... 1200000
+    """
+    if not text:
+        return None
+
+    result = VIEW_COUNT_REGEX.search(text)
+    if result is None:
+        # e.g. "No views"
+        return 0
+
+    number, suffix = result.groups()
+    locale = get_locale(language)
+    multiplier = locale.multipliers.get(suffix.lower().rstrip('.'))
+
+    if multiplier is None:
+        digits = re.sub(r'\D', '', number)
+        return int(digits) if digits else None
+
+    number = re.sub(r'\s', '', number)
+    if locale.decimal_separator == ',':
+        number = number.replace('.', '').replace(',', '.')
+    else:
+        number = number.replace(',', '')
+    return int(round(float(number) * multiplier))
+
+
+@lru_cache(maxsize=4096)
+def parse_duration(text: Optional[str]) -> Optional[int]:
+    """Returns the number of seconds from the duration text
+
+    >>> parse_duration('1:02:03')
+    ... 3723
+    """
+    if not text:
+        return None
+
+    result = DURATION_REGEX.match(text.strip())
+    if result is None:
+        return None
+
+    hours, minutes, seconds = result.groups()
+    return int(hours or 0) * HOUR + int(minutes) * MINUTE + int(seconds)
+
+
+@lru_cache(maxsize=4096)
+def parse_publication_offset(text: Optional[str], language: Optional[str] = 'en') -> Optional[int]:
+    """Returns the approximate number of seconds elapsed
+    since the publication from the publication text
+
+    >>> parse_publication_offset('3 weeks ago')
+    ... 1814400
+    """
+    if not text:
+        return None
+
+    result = PUBLICATION_REGEX.search(text)
+    if result is None:
+        return None
+
+    number, unit = result.groups()
+    seconds = get_unit_seconds(unit, get_locale(language))
+    if seconds is None:
+        return None
+    return int(number) * seconds
+
+
+def parse_publication_text(text: Optional[str], language: Optional[str] = 'en', reference: Optional[datetime.datetime] = None) -> Optional[datetime.datetime]:
+    """Returns the approximate publication date from the
+    publication text relative to the reference date which
+    is usually the time at which the results were fetched"""
+    offset = parse_publication_offset(text, language)
+    if offset is None:
+        return None
+
+    if reference is None:
+        reference = datetime.datetime.now(datetime.timezone.utc)
+    return reference - datetime.timedelta(seconds=offset)
+
+
+def normalize_page(items: Iterable[dict], language: Optional[str] = 'en', reference: Optional[datetime.datetime] = None) -> list[dict]:
+    """Adds the `view_count`, `duration_seconds` and `published_at`
+    numeric values to a page of items in bulk. Identical texts
+    which are frequent on a page (e.g. "4 years ago") are only
+    parsed once"""
+    if reference is None:
+        reference = datetime.datetime.now(datetime.timezone.utc)
+
+    items = list(items)
+    for item in items:
+        item['view_count'] = parse_view_count(
+            item.get('view_count_text'), language)
+        item['duration_seconds'] = parse_duration(item.get('duration'))
+        item['published_at'] = parse_publication_text(
+            item.get('publication_text'), language, reference)
+    return items
+
+
+def normalize_dataframe(df: 'pandas.DataFrame', language: Optional[str] = 'en', reference: Optional[datetime.datetime] = None) -> 'pandas.DataFrame':
+    """Adds the `view_count`, `duration_seconds` and `published_at`
+    columns to a DataFrame using vectorized string operations
+    instead of parsing each row individually"""
+    import pandas
+
+    if reference is None:
+        reference = datetime.datetime.now(datetime.timezone.utc)
+
+    locale = get_locale(language)
+    df = df.copy()
+
+    if 'view_count_text' in df.columns:
+        text = df['view_count_text'].astype('string')
+        parts = text.str.extract(VIEW_COUNT_REGEX.pattern)
+
+        digits = parts[0].str.replace(r'\D', '', regex=True)
+        plain = pandas.to_numeric(digits.replace('', None), errors='coerce')
+
+        decimal = parts[0].str.replace(r'\s', '', regex=True)
+        if locale.decimal_separator == ',':
+            decimal = decimal.str.replace('.', '', regex=False)
+            decimal = decimal.str.replace(',', '.', regex=False)
+        else:
+            decimal = decimal.str.replace(',', '', regex=False)
+        decimal = pandas.to_numeric(decimal, errors='coerce')
+
+        suffix = parts[1].str.lower().str.rstrip('.')
+        multiplier = pandas.to_numeric(
+            suffix.map(locale.multipliers), errors='coerce')
+
+        view_count = plain.where(
+            multiplier.isna(), (decimal * multiplier).round())
+        # Texts without any number e.g. "No views"
+        view_count = view_count.mask(text.notna() & parts[0].isna(), 0)
+        df['view_count'] = view_count.astype('Int64')
+
+    if 'duration' in df.columns:
+        parts = df['duration'].astype('string').str.strip()
+        parts = parts.str.extract(DURATION_REGEX.pattern)
+        parts = parts.apply(pandas.to_numeric, errors='coerce')
+        seconds = parts[0].fillna(0) * HOUR + parts[1] * MINUTE + parts[2]
+        df['duration_seconds'] = seconds.astype('Int64')
+
+    if 'publication_text' in df.columns:
+        parts = df['publication_text'].astype('string')
+        parts = parts.str.extract(PUBLICATION_REGEX.pattern)
+
+        # There are only a handful of distinct units
+        # so they are resolved once and then mapped
+        units = {
+            unit: get_unit_seconds(unit, locale)
+            for unit in parts[1].dropna().unique()
+        }
+        unit_seconds = pandas.to_numeric(
+            parts[1].map(units), errors='coerce')
+        offset = pandas.to_numeric(parts[0], errors='coerce') * unit_seconds
+        df['published_at'] = pandas.Timestamp(reference) - \
+            pandas.to_timedelta(offset, unit='s')
+
+    return df
@@ -0,0 +1,152 @@
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from youtube_searcher.constants import CLIENT_NAME, CLIENT_VERSION, USER_AGENT
+
+
+@dataclass(frozen=True)
+class ClientProfile:
+    """The identity presented to YouTube: the User-Agent
+    header and the client sent in the payload"""
+
+    user_agent: str = USER_AGENT
+    client_name: str = CLIENT_NAME
+    client_version: str = CLIENT_VERSION
+
+
+DEFAULT_PROFILE = ClientProfile()
+
+
+def is_failure_status(status_code: object) -> bool:
+    """Indicates whether the status code means that the
+    client should stop using this member for a while"""
+    if not isinstance(status_code, int):
+        return False
+    return status_code == 429 or 500 <= status_code < 600
+
+
+class PoolMember:
+    """A member of the pool is a proxy endpoint (or a direct
+    connection) paired with a client profile. Each member has
+    its own session and therefore its own connection pool"""
+
+    def __init__(self, proxy: Optional[str] = None, profile: ClientProfile = DEFAULT_PROFILE, pool_maxsize: int = 10):
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+
+        self.proxy = proxy
+        self.profile = profile
+
+        self.session = Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        if proxy is not None:
+            self.session.proxies = {'http': proxy, 'https': proxy}
+            # Ignore the proxies from the environment
+            # which would override the member's proxy
+            self.session.trust_env = False
+
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    def __repr__(self):
+        return f'<PoolMember [{self.proxy or "direct"}]>'
+
+    def is_healthy(self, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        return self.ejected_until <= now
+
+
+class ClientPool:
+    """A pool of proxy endpoints and client profiles. Requests are
+    sent using the least loaded healthy member. A member that returns
+    a 429 or a 5xx response (or fails to connect) is ejected for
+    `ejection_time` seconds, doubled on each consecutive failure up
+    to `max_ejection_time`, and is then re-admitted
+
+    >>> pool = ClientPool.from_proxies(
+    ...     ['http://10.0.0.1:3128', 'http://10.0.0.2:3128'],
+    ...     profiles=[ClientProfile(user_agent='Mozilla/5.0 ...')]
+    ... )
+    ... Videos.transport = Transport(pool=pool)
+    """
+
+    def __init__(self, members: Iterable[PoolMember], ejection_time: float = 30, max_ejection_time: float = 600):
+        self.members = list(members)
+        if not self.members:
+            raise ValueError('The pool requires at least one member')
+
+        self.ejection_time = ejection_time
+        self.max_ejection_time = max_ejection_time
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f'<ClientPool [{len(self.healthy_members)}/{len(self.members)}]>'
+
+    def __len__(self):
+        return len(self.members)
+
+    @classmethod
+    def from_proxies(cls, proxies: Iterable[Optional[str]], profiles: Optional[Iterable[ClientProfile]] = None, pool_maxsize: int = 10, **kwargs):
+        """Creates a pool with one member per proxy. The profiles
+        are assigned to the proxies in turn so that each proxy
+        always presents the same identity. Use None as a proxy
+        for a direct connection"""
+        profiles = itertools.cycle(list(profiles or [DEFAULT_PROFILE]))
+        members = [
+            PoolMember(proxy, next(profiles), pool_maxsize=pool_maxsize)
+            for proxy in proxies
+        ]
+        return cls(members, **kwargs)
+
+    @property
+    def healthy_members(self) -> list[PoolMember]:
+        now = time.monotonic()
+        return [member for member in self.members if member.is_healthy(now)]
+
+    def acquire(self, exclude: Iterable[PoolMember] = ()) -> PoolMember:
+        """Returns the least loaded healthy member. When every
+        member is ejected, the member that will be re-admitted
+        first is returned"""
+        exclude = set(map(id, exclude))
+
+        with self.lock:
+            now = time.monotonic()
+            candidates = [
+                member for member in self.members
+                if id(member) not in exclude
+            ] or self.members
+
+            healthy = [x for x in candidates if x.is_healthy(now)]
+            if healthy:
+                member = min(healthy, key=lambda x: (x.in_flight, x.requests))
+            else:
+                member = min(candidates, key=lambda x: x.ejected_until)
+
+            member.in_flight = member.in_flight + 1
+            member.requests = member.requests + 1
+            return member
+
+    def release(self, member: PoolMember, status_code: Optional[int] = None, error: Optional[Exception] = None):
+        """Returns the member to the pool and records the
+        outcome of the request that it sent"""
+        with self.lock:
+            member.in_flight = member.in_flight - 1
+
+            if error is not None or is_failure_status(status_code):
+                member.failures = member.failures + 1
+                ejection_time = min(
+                    self.ejection_time * 2 ** (member.failures - 1),
+                    self.max_ejection_time
+                )
+                member.ejected_until = time.monotonic() + ejection_time
+            else:
+                member.failures = 0
+                member.ejected_until = 0.0
@@ -1,11 +1,20 @@
 import dataclasses
+import datetime
+import heapq
 import inspect
+import itertools
+import operator
+import re
 from collections import OrderedDict, defaultdict
 from functools import cached_property
-from typing import Generic, Iterator, Optional, Type, Union
+from typing import (TYPE_CHECKING, AsyncIterator, Generic, Iterator, Optional,
+                    Type, Union)
 
 from youtube_searcher.typings import DC, QL, B, D
 
+if TYPE_CHECKING:
+    from youtube_searcher.sinks import BaseSink
+
 
 class Query(Generic[B]):
     def __init__(self, data: Union[D, list[D]]):
@@ -70,9 +79,15 @@ class QueryDict(Query):
 
         for key in self.keys:
             if queried_data is None:
-                is_valid, value = self.check(key, self.cache)
+                data = self.to_mapping(self.cache)
+                is_valid, value = self.check(key, data)
                 if is_valid:
                     queried_data = value
+                elif isinstance(value, list) and isinstance(data, dict) and key in data:
+                    # A list under the first key, even an
+                    # empty one, is returned as a QueryList
+                    queried_data = value
+                    break
             else:
                 is_valid, value = self.check(key, queried_data)
                 if is_valid:
@@ -88,6 +103,21 @@ class QueryDict(Query):
             return QueryList(queried_data)
         return QueryDict.new(queried_data)
 
+    @staticmethod
+    def to_mapping(data: object):
+        """Returns the dictionnary that is traversed for a class
+        or a model. Models that define `to_dict` (e.g. `VideoModel`)
+        are converted with it"""
+        if inspect.isclass(data):
+            return data.__dict__
+
+        if dataclasses.is_dataclass(data):
+            to_dict = getattr(data, 'to_dict', None)
+            if to_dict is not None:
+                return to_dict()
+            return dataclasses.asdict(data)
+        return data
+
     def check(self, key: str, data: D):
         """A function that indicates wether the item that
         we are trying to query is a dictionnary and therefore
@@ -104,11 +134,7 @@ class QueryDict(Query):
         if isinstance(data, (int, str, bool)):
             return False, data
 
-        if inspect.isclass(data):
-            data = data.__dict__
-
-        if dataclasses.is_dataclass(data):
-            data = dataclasses.asdict(data)
+        data = self.to_mapping(data)
 
         try:
             value = data[key]
@@ -174,50 +200,554 @@ class QueryList(Query):
         return self.data[-0]
 
 
+def resolve_path(item: object, path: Union[str, list[str]]):
+    """Returns the value stored under a `__` path on a model
+    or a dictionnary. None is returned if any of the intermediate
+    values is missing
+
+    >>> resolve_path(video, 'channel__channel_id')
+    ... 'UCZFWPqqPkFlNwIxcpsLOwew'
+    """
+    keys = path.split('__') if isinstance(path, str) else path
+
+    value = item
+    for key in keys:
+        if value is None:
+            return None
+
+        if isinstance(value, dict):
+            value = value.get(key)
+        else:
+            value = getattr(value, key, None)
+    return value
+
+
+def values_generator(items: Iterator[DC], fields: list[str]) -> Iterator[OrderedDict]:
+    fields_to_use = list(fields)
+
+    for item in items:
+        data = OrderedDict()
+
+        if not fields_to_use:
+            fields_to_use = list(map(
+                lambda x: x.name,
+                dataclasses.fields(item)
+            ))
+
+        for field in fields_to_use:
+            data[field] = resolve_path(item, field)
+        yield data
+
+
+def _compare(func):
+    def wrapper(value, other):
+        if value is None or other is None:
+            return False
+        try:
+            return func(value, other)
+        except TypeError:
+            return False
+    return wrapper
+
+
+def _lower(value):
+    return str(value).lower()
+
+
+LOOKUPS = {
+    'exact': lambda value, other: value == other,
+    'iexact': _compare(lambda value, other: _lower(value) == _lower(other)),
+    'contains': _compare(lambda value, other: other in value),
+    'icontains': _compare(lambda value, other: _lower(other) in _lower(value)),
+    'in': lambda value, other: value in other,
+    'gt': _compare(operator.gt),
+    'gte': _compare(operator.ge),
+    'lt': _compare(operator.lt),
+    'lte': _compare(operator.le),
+    'startswith': _compare(lambda value, other: value.startswith(other)),
+    'istartswith': _compare(lambda value, other: _lower(value).startswith(_lower(other))),
+    'endswith': _compare(lambda value, other: value.endswith(other)),
+    'iendswith': _compare(lambda value, other: _lower(value).endswith(_lower(other))),
+    'regex': _compare(lambda value, other: re.search(other, value) is not None),
+    'isnull': lambda value, other: (value is None) == bool(other)
+}
+
+
+class Condition:
+    """A single lookup of a filter e.g. `duration_seconds__lt=600`
+    which is compiled once and then evaluated on each model"""
+
+    def __init__(self, lookup: str, value: object):
+        keys = lookup.split('__')
+
+        if len(keys) > 1 and keys[-1] in LOOKUPS:
+            self.lookup_name = keys.pop()
+        else:
+            self.lookup_name = 'exact'
+
+        self.keys = keys
+        self.value = value
+        self.function = LOOKUPS[self.lookup_name]
+
+    def __repr__(self):
+        path = '__'.join(self.keys)
+        return f'<Condition [{path}__{self.lookup_name}={self.value!r}]>'
+
+    def __call__(self, item: DC) -> bool:
+        return self.function(resolve_path(item, self.keys), self.value)
+
+
+class _Descending:
+    """Reverses the natural ordering of a value
+    in order to sort by descending order"""
+
+    __slots__ = ['value']
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+class QuerySet(Generic[DC]):
+    """A lazy set of results on which filters and ordering
+    can be chained. Nothing is fetched until the queryset is
+    evaluated and the results are then streamed page by page
+    which means that a slice or `first` stops fetching as soon
+    as enough matching models were found
+
+    >>> instance = Videos('Arlette pop the baloon')
+    ... qs = instance.objects.filter(duration_seconds__lt=600)
+    ... qs.exclude(channel__channel_id='UCZFWPqqPkFlNwIxcpsLOwew')[:5]
+    """
+
+    def __init__(self, results_iterator: 'ResultsIterator'):
+        self.results_iterator = results_iterator
+        # Each group is a list of conditions that are combined
+        # with AND. The boolean indicates if the group is negated
+        self.groups: list[tuple[bool, list[Condition]]] = []
+        self.ordering: list[str] = []
+        self.low_mark = 0
+        self.high_mark: Optional[int] = None
+        self._result_cache: Optional[list[DC]] = None
+
+    def __repr__(self):
+        return f'<QuerySet [{self.results_iterator.search_instance}]>'
+
+    def __iter__(self) -> Iterator[DC]:
+        if self._result_cache is not None:
+            yield from self._result_cache
+            return
+
+        results = []
+        for item in self.iterator():
+            results.append(item)
+            yield item
+        self._result_cache = results
+
+    def __len__(self):
+        return len(self._fetch_all())
+
+    def __bool__(self):
+        return self.exists()
+
+    def __getitem__(self, key: Union[int, slice]):
+        if self._result_cache is not None:
+            return self._result_cache[key]
+
+        if isinstance(key, slice):
+            if (key.start is not None and key.start < 0) or (key.stop is not None and key.stop < 0):
+                raise ValueError('Negative indexing is not supported')
+
+            clone = self._clone()
+            clone._set_limits(key.start, key.stop)
+
+            if key.step is not None:
+                return list(clone)[::key.step]
+            return clone
+
+        if not isinstance(key, int):
+            raise TypeError('QuerySet indices must be integers or slices')
+
+        if key < 0:
+            raise ValueError('Negative indexing is not supported')
+
+        clone = self._clone()
+        clone._set_limits(key, key + 1)
+        results = list(clone)
+        if not results:
+            raise IndexError('QuerySet index out of range')
+        return results[0]
+
+    def _clone(self):
+        instance = self.__class__(self.results_iterator)
+        instance.groups = list(self.groups)
+        instance.ordering = list(self.ordering)
+        instance.low_mark = self.low_mark
+        instance.high_mark = self.high_mark
+        return instance
+
+    def _fetch_all(self) -> list[DC]:
+        if self._result_cache is None:
+            self._result_cache = list(self.iterator())
+        return self._result_cache
+
+    def _set_limits(self, low: Optional[int], high: Optional[int]):
+        # Limits are relative to the current slice
+        # e.g. qs[5:10][1:2] returns the sixth item
+        if high is not None:
+            if self.high_mark is not None:
+                self.high_mark = min(self.high_mark, self.low_mark + high)
+            else:
+                self.high_mark = self.low_mark + high
+
+        if low is not None:
+            if self.high_mark is not None:
+                self.low_mark = min(self.high_mark, self.low_mark + low)
+            else:
+                self.low_mark = self.low_mark + low
+
+    def _add_group(self, negated: bool, lookups: dict[str, object]):
+        if self.low_mark or self.high_mark is not None:
+            raise ValueError('Cannot filter a query once a slice has been taken')
+
+        clone = self._clone()
+        conditions = [Condition(key, value) for key, value in lookups.items()]
+        clone.groups.append((negated, conditions))
+        return clone
+
+    def _matches(self, item: DC) -> bool:
+        for negated, conditions in self.groups:
+            result = all(condition(item) for condition in conditions)
+            if result == negated:
+                return False
+        return True
+
+    def _ordering_key(self):
+        fields = []
+        for field in self.ordering:
+            descending = field.startswith('-')
+            fields.append((descending, field.lstrip('-').split('__')))
+
+        def key(item: DC):
+            values = []
+            for descending, keys in fields:
+                value = resolve_path(item, keys)
+                # Models without a value are always
+                # returned after the other models
+                if value is None:
+                    values.append((True, 0))
+                elif descending:
+                    values.append((False, _Descending(value)))
+                else:
+                    values.append((False, value))
+            return values
+        return key
+
+    def iterator(self) -> Iterator[DC]:
+        """Evaluates the queryset as a stream without
+        caching the results"""
+        items = filter(self._matches, self.results_iterator)
+
+        if self.ordering:
+            key = self._ordering_key()
+            if self.high_mark is not None:
+                # Only the top k models need to be kept in
+                # memory when the queryset is sliced
+                items = heapq.nsmallest(self.high_mark, items, key=key)
+            else:
+                items = sorted(items, key=key)
+
+        yield from itertools.islice(items, self.low_mark, self.high_mark)
+
+    def all(self):
+        return self._clone()
+
+    def filter(self, **lookups: object):
+        """Returns the models matching all the lookups. Lookups
+        use the `__` path syntax and an optional lookup name
+
+        >>> instance.objects.filter(view_count__gte=1000, title__icontains='live')
+        """
+        return self._add_group(False, lookups)
+
+    def exclude(self, **lookups: object):
+        """Returns the models that do not match
+        all the given lookups"""
+        return self._add_group(True, lookups)
+
+    def order_by(self, *fields: str):
+        """Orders the models by the given fields. Prefix
+        the field with `-` for descending order"""
+        if self.low_mark or self.high_mark is not None:
+            raise ValueError('Cannot reorder a query once a slice has been taken')
+
+        clone = self._clone()
+        clone.ordering = list(fields)
+        return clone
+
+    def first(self) -> Optional[DC]:
+        if self._result_cache is not None:
+            return self._result_cache[0] if self._result_cache else None
+
+        for item in self[:1]:
+            return item
+        return None
+
+    def count(self) -> int:
+        if self._result_cache is not None:
+            return len(self._result_cache)
+        return sum(1 for _ in self.iterator())
+
+    def exists(self) -> bool:
+        return self.first() is not None
+
+    def values_list(self, *fields: str) -> list[OrderedDict]:
+        return list(values_generator(self, fields))
+
+
+class Pagination(Generic[DC]):
+    """The state of an iteration over the pages of results of a
+    search: the number of models that were returned and whether
+    the next page should be requested. The synchronous and the
+    asynchronous iterations share this state and only differ
+    in the way the requests are sent"""
+
+    def __init__(self, results_iterator: 'ResultsIterator', continuation_key: Optional[str] = None):
+        self.results_iterator = results_iterator
+        self.search_instance = results_iterator.search_instance
+        self.limit = self.search_instance.limit
+        self.max_pages = getattr(self.search_instance, 'max_pages', None)
+        self.count = 0
+        self.pages = 0
+
+        # Each iteration starts from the first page (or from the
+        # given token) regardless of where the last one stopped
+        self.search_instance.continuation_key = continuation_key
+        self.is_continuation = continuation_key is not None
+        # Every token that was followed so that a cycle
+        # of tokens (A → B → A) does not paginate forever
+        self.seen_tokens: set[str] = set()
+        if continuation_key is not None:
+            self.seen_tokens.add(continuation_key)
+
+    def __repr__(self):
+        return f'<Pagination [{self.count}]>'
+
+    @property
+    def exhausted(self) -> bool:
+        return self.limit is not None and self.count >= self.limit
+
+    def models(self, response_data: D) -> Iterator[DC]:
+        """Returns the models of the page up to the limit. The
+        continuation token of the page is stored on the search
+        instance while the models are extracted"""
+        self.search_instance.continuation_key = None
+        self.pages = self.pages + 1
+        models = self.results_iterator.get_models(
+            response_data, self.is_continuation)
+        return self.take(models)
+
+    def take(self, models: Iterator[DC]) -> Iterator[DC]:
+        if self.exhausted:
+            return
+
+        for model in models:
+            self.count = self.count + 1
+            yield model
+
+            if self.exhausted:
+                return
+
+    def has_next_page(self) -> bool:
+        """Indicates whether the next page should be requested
+        once the models of the current page were consumed"""
+        if self.exhausted:
+            return False
+
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return False
+
+        token = self.search_instance.continuation_key
+        if token is None or token in self.seen_tokens:
+            return False
+
+        self.seen_tokens.add(token)
+        self.is_continuation = True
+        return True
+
+
 class ResultsIterator(Generic[B, DC]):
     def __init__(self):
+        self.name = 'objects'
         self.search_instance: Optional[B] = None
         self.response_data: Optional[D] = None
 
+    def __set_name__(self, owner: Type[B], name: str):
+        self.name = name
+
     def __get__(self, instance: B, cls: Optional[Type[B]] = None):
-        self.search_instance = instance
-        return self
+        if instance is None:
+            return self
+
+        # Each search instance gets its own iterator so that
+        # the responses are not shared between instances
+        results_iterator = self.__class__()
+        results_iterator.name = self.name
+        results_iterator.search_instance = instance
+        instance.__dict__[self.name] = results_iterator
+        return results_iterator
 
     def __iter__(self) -> Iterator[DC]:
+        for models in self.iter_pages():
+            yield from models
+
+    async def __aiter__(self) -> AsyncIterator[DC]:
+        async for models in self.apages():
+            for model in models:
+                yield model
+
+    def __getitem__(self, key: Union[int, slice]):
+        return self.get_queryset()[key]
+
+    @property
+    def data(self) -> dict[str, str] | None:
         self.load_cache()
-        instance = QueryDict(self.response_data)
+        return self.response_data
 
-        # Full clean can modify the initial query dict
-        # instance by returning a different one
-        instance = self.search_instance.full_clean(instance)
-        if instance is None:
-            raise ValueError('Full clean should return a value')
+    def pages(self) -> Iterator[list[DC]]:
+        """Yields the models of each page of results by following
+        the continuation tokens. The next page is only requested
+        once the previous one was consumed"""
+        for models in self.iter_pages():
+            yield list(models)
+
+    def iter_pages(self, cache: bool = True, continuation_key: Optional[str] = None) -> Iterator[Iterator[DC]]:
+        """Yields a generator of models for each page of results. Each
+        generator has to be exhausted before advancing to the next page
+        since the continuation token is read during the extraction.
+        When `cache` is False, the first response is not stored on
+        the iterator and each raw page is released as soon as its
+        items were extracted. The iteration starts from the first
+        page unless a `continuation_key` is given"""
+        pagination = Pagination(self, continuation_key)
+
+        if cache and continuation_key is None:
+            self.load_cache()
+            response_data = self.response_data
+        else:
+            response_data = self.send_request()
 
-        if not isinstance(instance, QueryDict):
-            raise ValueError('Full clean return value should be a QueryDict')
+        while response_data is not None:
+            yield pagination.models(response_data)
 
-        if self.search_instance.path_to_items is None:
-            raise ValueError('Should set path to items')
+            # Only the continuation token is kept
+            # while the next page is requested
+            response_data = None
+            if pagination.has_next_page():
+                response_data = self.send_request()
 
-        queryset = instance.filter(self.search_instance.path_to_items)
-        items = self.search_instance.result_generator(queryset)
+    def iterator(self, chunk_size: int = 100) -> Iterator[DC]:
+        """Streams the models using a constant amount of memory. The
+        models are built `chunk_size` at a time and the raw pages are
+        not cached which makes this method suitable for long crawls
+
+        >>> instance = Videos('Arlette pop the baloon', limit=None)
+        ... for video in instance.objects.iterator(chunk_size=50):
+        ...     print(video.video_id)
+        """
+        if chunk_size < 1:
+            raise ValueError('Chunk size should be greater than 0')
+
+        for models in self.iter_pages(cache=False):
+            while True:
+                chunk = list(itertools.islice(models, chunk_size))
+                if not chunk:
+                    break
+                yield from chunk
+
+    async def apages(self) -> AsyncIterator[list[DC]]:
+        """The asyncio equivalent of `pages`"""
+        pagination = Pagination(self)
+
+        if not self.response_data:
+            self.response_data = await self.asend_request()
+        response_data = self.response_data
+
+        while response_data is not None:
+            yield list(pagination.models(response_data))
 
+            response_data = None
+            if pagination.has_next_page():
+                response_data = await self.asend_request()
+
+    def get_models(self, response_data: D, is_continuation: bool = False) -> Iterator[DC]:
         if self.search_instance.model is None:
             raise ValueError('model cannot be None')
 
+        if is_continuation:
+            queryset = self.search_instance.get_continuation_items(
+                response_data)
+        elif self.search_instance.content_resolver is not None and self.search_instance.path_to_items is None:
+            queryset = self.search_instance.get_items(response_data)
+        else:
+            instance = QueryDict(response_data)
+
+            # Full clean can modify the initial query dict
+            # instance by returning a different one
+            instance = self.search_instance.full_clean(instance)
+            if instance is None:
+                raise ValueError('Full clean should return a value')
+
+            if not isinstance(instance, QueryDict):
+                raise ValueError(
+                    'Full clean return value should be a QueryDict')
+
+            if self.search_instance.path_to_items is None:
+                raise ValueError('Should set path to items')
+
+            queryset = instance.filter(self.search_instance.path_to_items)
+
+        items = self.search_instance.result_generator(queryset)
+
         for item in items:
             if isinstance(item, QueryDict):
                 item = item.cache
             yield self.search_instance.model(**item)
 
-    @cached_property
-    def data(self) -> dict[str, str] | None:
-        self.load_cache()
-        return self.response_data
+    def get_queryset(self) -> QuerySet[DC]:
+        return QuerySet(self)
 
     def all(self) -> list[DC]:
         return list(self)
 
+    async def aall(self) -> list[DC]:
+        """The asyncio equivalent of `all`
+
+        >>> instance = Videos('Arlette pop the baloon', limit=2)
+        ... await instance.objects.aall()
+        """
+        return [item async for item in self]
+
+    def filter(self, **lookups: object) -> QuerySet[DC]:
+        return self.get_queryset().filter(**lookups)
+
+    def exclude(self, **lookups: object) -> QuerySet[DC]:
+        return self.get_queryset().exclude(**lookups)
+
+    def order_by(self, *fields: str) -> QuerySet[DC]:
+        return self.get_queryset().order_by(*fields)
+
+    def first(self) -> Optional[DC]:
+        return self.get_queryset().first()
+
+    def count(self) -> int:
+        return self.get_queryset().count()
+
     def values_list(self, *fields):
         """Returns a subset of values matching the given
         fields from the dataset
@@ -226,46 +756,88 @@ class ResultsIterator(Generic[B, DC]):
         ... instance.objects.values_list('video_id', 'title')
         ... [OrderedDict({'video_id': 'MVkuHKIPWgs', 'title': 'Ep 51'})]
         """
-        fields = list(fields)
+        return list(values_generator(self.all(), fields))
 
-        def dict_generator(fields_to_use: list[str]):
-            for item in self.all():
-                data = OrderedDict()
+    def dataframe(self, *fields: str, normalize: bool = True):
+        """Returns the results as a pandas DataFrame. When `normalize`
+        is True, the numeric `view_count`, `duration_seconds` and
+        `published_at` columns are computed over the whole frame
+        at once
 
-                if not fields_to_use:
-                    fields_to_use = map(
-                        lambda x: x.name,
-                        dataclasses.fields(item)
-                    )
+        >>> instance = Videos('Arlette pop the baloon', limit=2)
+        ... df = instance.objects.dataframe('video_id', 'view_count_text')
+        ... df.sort_values('view_count')
+        """
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError(
+                'dataframe requires pandas. '
+                'Install it with: pip install pandas'
+            )
+
+        from youtube_searcher.normalizers import normalize_dataframe
+
+        df = pandas.DataFrame(self.values_list(*fields))
+        if normalize:
+            df = normalize_dataframe(
+                df,
+                language=self.search_instance.language,
+                reference=self.search_instance.fetched_at
+            )
+        return df
+
+    def pipe(self, sink: 'BaseSink') -> int:
+        """Streams the results into a sink and returns the
+        number of models that were written. Like `iterator`,
+        the pages are not cached on the iterator
+
+        >>> instance = Videos('Arlette pop the baloon', limit=2)
+        ... with SQLiteSink('videos.sqlite') as sink:
+        ...     instance.objects.pipe(sink)
+        ... 2
+        """
+        return sink.consume_pages(self.iter_pages(cache=False))
 
-                for field in fields_to_use:
-                    if '__' in field:
-                        lhv, rhv = field.split('__')
-                        relationship = getattr(item, lhv)
-                        data[field] = getattr(relationship, rhv)
-                        continue
+    def send_request(self) -> D:
+        """Creates and sends the request to YouTube using the
+        current state of the search instance and returns the
+        decoded response"""
+        transport = self.search_instance.transport
+
+        try:
+            response_data = transport.send(self.search_instance)
+        except Exception as e:
+            raise Exception('Could not send request') from e
+        return self.process_response(response_data)
 
-                    data[field] = getattr(item, field)
-                yield data
-        return list(dict_generator(fields))
+    async def asend_request(self) -> D:
+        """The asyncio equivalent of `send_request`"""
+        transport = self.search_instance.transport
+
+        try:
+            response_data = await transport.asend(self.search_instance)
+        except Exception as e:
+            raise Exception('Could not send request') from e
+        return self.process_response(response_data)
+
+    def process_response(self, response_data: D) -> D:
+        self.search_instance.fetched_at = datetime.datetime.now(
+            datetime.timezone.utc)
+
+        if 'estimatedResults' in response_data:
+            value = response_data['estimatedResults']
+            self.search_instance.estimated_results = int(value)
+        return response_data
 
     def load_cache(self, refresh: bool = False):
         """Method that used to create and send the request 
         to YouTube search url. The results are stored in
         the cache of the class"""
-        if self.response_data:
+        if self.response_data and not refresh:
             return
 
         if self.search_instance is not None:
-            session, request = self.search_instance.create_request()
-
-            try:
-                response = session.send(request)
-            except:
-                raise Exception('Could not send request')
-            else:
-                self.response_data = response.json()
-
-            if 'estimatedResults' in self.response_data:
-                value = self.response_data['estimatedResults']
-                self.search_instance.estimated_results = int(value)
+            # The cache always holds the first page
+            self.search_instance.continuation_key = None
+            self.response_data = self.send_request()
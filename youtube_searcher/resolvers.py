@@ -0,0 +1,82 @@
+from collections import Counter
+from typing import Optional, Union
+
+from youtube_searcher.extractors import Accessor
+from youtube_searcher.typings import D
+
+Path = Union[str, list[Union[str, int]]]
+
+MISSING = object()
+
+
+class LayoutResolver:
+    """Returns the list of items of a response that can be served
+    in several layouts. The candidate paths are tried in order but
+    the layout that matched the last response is always tried first
+    so that, in the common case, a single traversal is done per
+    response. Missing keys are not reported: the number of responses
+    matched by each layout is counted in `hits` and the responses
+    that matched none of them are counted in `misses`. The counters
+    are not locked and are therefore approximate when the resolver
+    is shared by several threads
+
+    >>> resolver = LayoutResolver({
+    ...     'section_list': CONTENT_PATH,
+    ...     'rich_grid': FALLBACK_CONTENT_PATH
+    ... })
+    ... resolver(response_data)
+    ... [{'itemSectionRenderer': {...}}, ...]
+    ... resolver.hits
+    ... Counter({'section_list': 1})
+    """
+
+    def __init__(self, layouts: dict[str, Path]):
+        if not layouts:
+            raise ValueError('The resolver requires at least one layout')
+
+        self.accessors = {
+            name: Accessor(path, default=MISSING)
+            for name, path in layouts.items()
+        }
+        self.last_layout: Optional[str] = None
+        self.hits: Counter[str] = Counter()
+        self.misses = 0
+
+    def __repr__(self):
+        return f'<LayoutResolver {list(self.accessors)}>'
+
+    def __call__(self, response_data: D) -> list[D]:
+        _, items = self.resolve(response_data)
+        return items
+
+    @property
+    def layouts(self) -> list[str]:
+        """The names of the layouts in the order
+        in which they are tried"""
+        names = list(self.accessors)
+        if self.last_layout is not None:
+            names.remove(self.last_layout)
+            names.insert(0, self.last_layout)
+        return names
+
+    def resolve(self, response_data: D) -> tuple[Optional[str], list[D]]:
+        """Returns the name of the layout that matched the
+        response and its items. When none of the layouts
+        match, None and an empty list are returned"""
+        for name in self.layouts:
+            items = self.accessors[name](response_data)
+            if isinstance(items, list):
+                self.last_layout = name
+                self.hits[name] += 1
+                return name, items
+
+        self.misses = self.misses + 1
+        return None, []
+
+    def stats(self) -> dict[str, int]:
+        return {**self.hits, 'misses': self.misses}
+
+    def reset(self):
+        self.last_layout = None
+        self.hits.clear()
+        self.misses = 0
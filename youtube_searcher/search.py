@@ -1,26 +1,58 @@
+import copy
+import datetime
 import json
 from typing import Generic, Iterator, Optional, Self
 from urllib.parse import urlencode
 
-from requests import Request, Session
-
-from youtube_searcher.constants import SEARCH_KEY, USER_AGENT, SearchModes
+from youtube_searcher.constants import (BROWSE_CONTENT_PATH,
+                                        BROWSE_CONTINUATION_CONTENT_PATH,
+                                        BROWSE_EXPANDABLE_CONTENT_PATH,
+                                        BROWSE_RICH_GRID_CONTENT_PATH,
+                                        CONTENT_PATH,
+                                        CONTINUATION_CONTENT_PATH,
+                                        FALLBACK_CONTENT_PATH, SEARCH_KEY,
+                                        SearchModes)
+from youtube_searcher.extractors import Extractor, video_extractor
 from youtube_searcher.models.channels import ChannelModel
-from youtube_searcher.models.videos import (SimpleChannelModel, ThumbnailModel,
-                                            VideoModel)
-from youtube_searcher.query import Query, QueryDict, ResultsIterator
+from youtube_searcher.models.videos import VideoModel
+from youtube_searcher.pool import DEFAULT_PROFILE, ClientProfile
+from youtube_searcher.query import QueryDict, QueryList, ResultsIterator
+from youtube_searcher.resolvers import LayoutResolver
+from youtube_searcher.templates import template_cache
+from youtube_searcher.transport import Transport, default_transport
 from youtube_searcher.typings import DC, QL, D, Q
 
 
+# The default limit of the searches: only the first page of
+# results is requested unless a limit is given explicitly
+FIRST_PAGE = object()
+
+
 class BaseSearch(Generic[Q, QL, DC]):
     model: DC = None
     base_url: str = None
+    extractor: Optional[Extractor] = None
+    # Resolve the list of items in the initial responses and
+    # in the responses that were requested with a continuation
+    # token. When there is no content resolver or when the
+    # `path_to_items` of the instance is set, the items of the
+    # initial response are queried using `path_to_items` once
+    # the response went through `full_clean`
+    content_resolver: Optional[LayoutResolver] = None
+    continuation_resolver: Optional[LayoutResolver] = None
+    transport: Transport = default_transport
+    # The fields of the payload that are stamped
+    # in the request template for each request
+    template_variables: tuple[str, ...] = ()
+    # YouTube returns indented JSON unless told
+    # otherwise which inflates the responses
+    pretty_print: bool = False
     objects = ResultsIterator()
 
     def __init__(
         self,
         query: str,
-        limit: Optional[int] = 10,
+        limit: Optional[int] = FIRST_PAGE,
         language: Optional[str] = 'en',
         region: Optional[str] = 'US',
         search_preferences: Optional[str] = None,
@@ -28,13 +60,28 @@ class BaseSearch(Generic[Q, QL, DC]):
         browse_id: str = None
     ):
         self.query = query
-        self.limit = limit
+        # The number of pages that are requested, None
+        # meaning that the pages are requested until
+        # the limit is reached or there are no more
+        if limit is FIRST_PAGE:
+            self.limit = None
+            self.max_pages = 1
+        else:
+            self.limit = limit
+            self.max_pages = None
         self.language = language
         self.region = region
         self.search_preferences = search_preferences
         self.timeout = timeout
         self.continuation_key = None
         self.estimate_results: Optional[int] = None
+        # The time at which the last response was
+        # received by the results iterator
+        self.fetched_at: Optional[datetime.datetime] = None
+        # The identity used for the requests. When the transport
+        # uses a client pool, the profile of the member that sends
+        # the request is used for that request instead
+        self.client_profile: ClientProfile = DEFAULT_PROFILE
         self.browse_id = browse_id
         # The path to the list of items that
         # we are interested in a__b__c
@@ -51,7 +98,13 @@ class BaseSearch(Generic[Q, QL, DC]):
         """Custom method used to generate the final results
         of a target element within the response data. The target
         value should return a list of dictionnaries containing
-        the key, value pairs that should be kept"""
+        the key, value pairs that should be kept. When an `extractor`
+        is set on the class, the items are dispatched to the handlers
+        registered for their renderer key"""
+        if self.extractor is not None:
+            yield from self.extractor.extract(queryset, self)
+            return
+
         if isinstance(queryset, QueryDict):
             raise ValueError(
                 "Result generator requires a "
@@ -64,7 +117,24 @@ class BaseSearch(Generic[Q, QL, DC]):
         for item in queryset:
             yield item
 
+    def get_items(self, response_data: D) -> QL:
+        """Returns the list of items from the initial
+        response using the content resolver"""
+        if self.content_resolver is None:
+            raise ValueError('content_resolver cannot be None')
+        return QueryList(self.content_resolver(response_data))
+
+    def get_continuation_items(self, response_data: D) -> QL:
+        """Returns the list of items from a response that was
+        requested using a continuation token. These responses
+        do not have the same structure as the initial one"""
+        if self.continuation_resolver is None:
+            return QueryList([])
+        return QueryList(self.continuation_resolver(response_data))
+
     def get_url(self, **query: str):
+        if not self.pretty_print:
+            query.setdefault('prettyPrint', 'false')
         encoded_key = urlencode({'key': SEARCH_KEY, **query})
         return f'{self.base_url}?{encoded_key}'
 
@@ -74,8 +144,8 @@ class BaseSearch(Generic[Q, QL, DC]):
         base_payload = {
             'context': {
                 'client': {
-                    'clientName': 'WEB',
-                    'clientVersion': '2.20210224.06.00',
+                    'clientName': self.client_profile.client_name,
+                    'clientVersion': self.client_profile.client_version,
                     'newVisitorCookie': True
                 },
                 'user': {
@@ -85,8 +155,43 @@ class BaseSearch(Generic[Q, QL, DC]):
         }
         return base_payload | extra
 
-    def create_request(self, exta_payload: dict[str, str] = {}, url_query: dict[str, str] = {}):
-        session = Session()
+    def get_request_key(self) -> tuple:
+        """Returns a key that identifies the request: the template
+        key, the url and the variable fields of the payload. Two
+        searches with the same key send the exact same request. The
+        payload is not serialized which keeps the key cheap"""
+        variables = tuple(sorted(self.get_template_variables().items()))
+        return (self.get_template_key(), self.get_url(), variables)
+
+    def get_headers(self) -> dict[str, str]:
+        return {
+            'Content-Type': 'application/json; charset=utf-8',
+            'User-Agent': self.client_profile.user_agent
+        }
+
+    def get_template_variables(self) -> dict[str, str]:
+        """Returns the fields of the payload that change from
+        one request to another (e.g. the query) and which are
+        therefore not stored in the request template"""
+        return {}
+
+    def get_template_key(self):
+        """Returns the key under which the request template
+        for this search is stored"""
+        return (
+            self.__class__,
+            self.language,
+            self.region,
+            self.search_preferences,
+            self.client_profile
+        )
+
+    def prepare_request(self, exta_payload: dict[str, str] = {}, url_query: dict[str, str] = {}):
+        """Builds the complete request from scratch without
+        using the request templates"""
+        from requests import Request
+
+        session = self.transport.get_session()
 
         payload = self.get_payload(**exta_payload)
         data = json.dumps(payload).encode('utf-8')
@@ -104,38 +209,53 @@ class BaseSearch(Generic[Q, QL, DC]):
         request = Request(**params)
         prepared_request = session.prepare_request(request)
 
-        prepared_request.headers.update(**{
-            'Content-Type': 'application/json; charset=utf-8',
-            'Content-Length': len(data),
-            'User-Agent': USER_AGENT
-        })
+        prepared_request.headers.update(**self.get_headers())
+        prepared_request.headers['Content-Length'] = str(len(data))
 
         return session, prepared_request
 
+    def create_request(self, exta_payload: dict[str, str] = {}, url_query: dict[str, str] = {}, client_profile: Optional[ClientProfile] = None):
+        """Creates the request that will be sent to YouTube. The
+        static parts of the request are built once per kind of
+        search and only the variable fields are serialized. When
+        `client_profile` is given, it is used for this request only
+        and the search instance is left unchanged"""
+        if client_profile is not None and client_profile != self.client_profile:
+            instance = copy.copy(self)
+            instance.client_profile = client_profile
+            return instance.create_request(exta_payload, url_query)
 
-class ModelsGeneratorMixin:
-    """Implements basic generators for common items
-    whene creating trying to render the data"""
+        if exta_payload or url_query:
+            return self.prepare_request(exta_payload, url_query)
 
-    def _thumbnails_generator(self, values: list[dict[str, str]]):
-        for item in values:
-            yield ThumbnailModel(**item)
+        template = template_cache.get(self)
+        request = template.prepare(self.get_template_variables())
+        return self.transport.get_session(), request
 
 
 class Search(BaseSearch):
-    def __init__(self, query: str, *, limit: int = 20, **kwargs: str | int):
+    def __init__(self, query: str, *, limit: Optional[int] = FIRST_PAGE, **kwargs: str | int):
         super().__init__(query, limit, **kwargs)
 
 
-class Videos(ModelsGeneratorMixin, BaseSearch):
+class Videos(BaseSearch):
     """Search videos on YouTube"""
 
     model = VideoModel
     base_url = 'https://www.youtube.com/youtubei/v1/search'
-
-    def __init__(self, query: str, *, limit: int = 20, **kwargs: str):
+    extractor = video_extractor
+    content_resolver = LayoutResolver({
+        'section_list': CONTENT_PATH,
+        'rich_grid': FALLBACK_CONTENT_PATH
+    })
+    continuation_resolver = LayoutResolver({
+        'commands': CONTINUATION_CONTENT_PATH,
+        'actions': BROWSE_CONTINUATION_CONTENT_PATH
+    })
+    template_variables = ('query', 'continuation')
+
+    def __init__(self, query: str, *, limit: Optional[int] = FIRST_PAGE, **kwargs: str):
         super().__init__(query, limit, search_preferences=SearchModes.videos, **kwargs)
-        self.path_to_items = 'contents__twoColumnSearchResultsRenderer__primaryContents__sectionListRenderer__contents'
 
     # @classmethod
     # def new(cls, query: str, current_instance: Self):
@@ -149,44 +269,9 @@ class Videos(ModelsGeneratorMixin, BaseSearch):
     #         setattr(instance, key, getattr(current_instance, key))
     #     return instance
 
-    def _channel_generator(self, values: dict[str, str]):
-        title = values['text']
-        channel_id = values['navigationEndpoint']['browseEndpoint']['browseId']
-        return SimpleChannelModel(channel_id, title)
-
-    def result_generator(self, queryset: Query) -> Iterator[D]:
-        for item in queryset:
-            if 'itemSectionRenderer' in item:
-                for content in item['itemSectionRenderer']['contents']:
-                    value = content.get('videoRenderer', None)
-
-                    if value is None:
-                        continue
-
-                    channel = value['ownerText']['runs'][0]
-                    thumbnails = self._thumbnails_generator(
-                        value['thumbnail']['thumbnails'])
-
-                    yield {
-                        'video_id': value['videoId'],
-                        'thumbnails': list(thumbnails),
-                        'title': value['title']['runs'][0]['text'],
-                        'publication_text': value['publishedTimeText']['simpleText'],
-                        'duration': value['lengthText']['simpleText'],
-                        'view_count_text': value['viewCountText']['simpleText'],
-                        'search_key': value['searchVideoResultEntityKey'],
-                        'channel': self._channel_generator(channel)
-                    }
-            elif 'continuationItemRenderer' in item:
-                # Parse the contuniation key e.g. the key that can
-                # be used to get the other videos in the search
-                path = 'continuationItemRenderer__continuationEndpoint__continuationCommand__token'
-                self.continuation_key = item.get(path)
-
     def get_payload(self, **extra: dict[str, str]):
         payload = super().get_payload(**extra)
 
-        payload['query'] = self.query
         payload['client'] = {
             'hl': self.language,
             'gl': self.region
@@ -195,10 +280,15 @@ class Videos(ModelsGeneratorMixin, BaseSearch):
         if self.search_preferences:
             payload['params'] = self.search_preferences
 
-        if self.continuation_key is not None:
-            payload['continuation'] = self.continuation_key
+        payload.update(self.get_template_variables())
         return payload
 
+    def get_template_variables(self):
+        variables = {'query': self.query}
+        if self.continuation_key is not None:
+            variables['continuation'] = self.continuation_key
+        return variables
+
     # def next(self):
     #     return self.new(self.query, self.limit)
 
@@ -211,12 +301,25 @@ class Playlists(BaseSearch):
     pass
 
 
-class ChannelVideos(ModelsGeneratorMixin, BaseSearch):
+class ChannelVideos(BaseSearch):
     """Searches for videos in specific channel in YouTube
     """
 
     model = VideoModel
     base_url = 'https://www.youtube.com/youtubei/v1/browse'
+    extractor = video_extractor
+    # The search results are in the last tab
+    # of the channel page
+    content_resolver = LayoutResolver({
+        'expandable_tab': BROWSE_EXPANDABLE_CONTENT_PATH,
+        'tab': BROWSE_CONTENT_PATH,
+        'rich_grid_tab': BROWSE_RICH_GRID_CONTENT_PATH
+    })
+    continuation_resolver = LayoutResolver({
+        'actions': BROWSE_CONTINUATION_CONTENT_PATH,
+        'commands': CONTINUATION_CONTENT_PATH
+    })
+    template_variables = ('params', 'browseId', 'continuation')
 
     def __init__(self, query: str, channel_id: str, **kwargs):
         kwargs.update(**{
@@ -225,68 +328,18 @@ class ChannelVideos(ModelsGeneratorMixin, BaseSearch):
         })
         super().__init__(query, **kwargs)
 
-    def full_clean(self, query_dict):
-        path = 'contents__twoColumnBrowseResultsRenderer__tabs'
-        last_tab = query_dict.filter(path).last()
-
-        if 'expandableTabRenderer' in last_tab:
-            self.path_to_items = 'expandableTabRenderer__content__sectionListRenderer__contents'
-            return last_tab
-        else:
-            tab_renderer = last_tab.filter('tabRenderer')
-            if 'content' in tab_renderer:
-                self.path_to_items = 'content__sectionListRenderer__contents'
-                return tab_renderer
-            return []
-
-    def get_url(self, **query):
-        query.update(**{'prettyPrint': 'false'})
-        return super().get_url(**query)
-
-    def result_generator(self, queryset: Query):
-        # itemSectionRenderer -> contents[] -> videoRenderer
-        for item in queryset:
-            if 'gridPlaylistRenderer' in item:
-                continue
-
-            if 'itemSectionRenderer' in item:
-                for content in item['itemSectionRenderer']['contents']:
-                    if 'videoRenderer' in content:
-                        video_details = content['videoRenderer']
-                        thumbnails = self._thumbnails_generator(
-                            video_details['thumbnail']['thumbnails'])
-
-                        description = video_details.get(
-                            'descriptionSnippet', None)
-                        if description is not None:
-                            description = description['runs'][0]['text']
-
-                        yield {
-                            'video_id': video_details['videoId'],
-                            'thumbnails': list(thumbnails),
-                            'title': video_details['title']['runs'][0]['text'],
-                            'publication_text': video_details['publishedTimeText']['simpleText'],
-                            'duration': video_details['lengthText']['simpleText'],
-                            'view_count_text': video_details['viewCountText']['simpleText'],
-                            'description': description
-                        }
-
-                    if 'playlistRenderer' in content:
-                        continue
-
-            if 'continuationItemRenderer' in item:
-                # For endless scrolling, not needed here
-                continue
-
     def get_payload(self, **extra):
         payload = super().get_payload(**extra)
+        payload.update(self.get_template_variables())
+        return payload
 
+    def get_template_variables(self):
         if self.continuation_key is None:
-            payload['params'] = self.search_preferences
-            payload['browseId'] = self.browse_id
-        else:
-            payload['continuation'] = self.continuation_key
-        return payload
+            return {
+                'params': self.search_preferences,
+                'browseId': self.browse_id
+            }
+        return {'continuation': self.continuation_key}
 
 
 class Custom(BaseSearch):
@@ -0,0 +1,329 @@
+import dataclasses
+import json
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Iterable, Iterator, Optional
+
+from youtube_searcher.models.videos import LazyThumbnails
+from youtube_searcher.typings import DC
+
+# The columns that are persisted by the sinks. The name
+# of the column is the same `__` path that is used to
+# get the value from the model which means that it can
+# directly be used with `values_list`
+COLUMNS = [
+    'video_id',
+    'title',
+    'publication_text',
+    'duration',
+    'view_count_text',
+    'search_key',
+    'youtube_link',
+    'description',
+    'channel__channel_id',
+    'channel__title',
+    'thumbnails'
+]
+
+
+def serialize_model(item: DC, columns: list[str] = COLUMNS) -> dict[str, str]:
+    """Transforms a model into a flat row where each column
+    is the value stored under the `__` path of the column"""
+    row = {}
+    for column in columns:
+        if column == 'thumbnails':
+            thumbnails = getattr(item, 'thumbnails', None) or []
+            if isinstance(thumbnails, LazyThumbnails):
+                # Serialize the raw thumbnails when they
+                # were not built by the model
+                thumbnails = thumbnails.to_list()
+            row[column] = json.dumps([
+                dataclasses.asdict(x) if dataclasses.is_dataclass(x) else x
+                for x in thumbnails
+            ])
+            continue
+
+        value = item
+        for key in column.split('__'):
+            value = getattr(value, key, None)
+            if value is None:
+                break
+        row[column] = value
+    return row
+
+
+def column_definitions(columns: list[str] = COLUMNS) -> str:
+    """Returns the definitions of the columns of a SQLite
+    table storing the rows, keyed on `video_id`"""
+    return ', '.join(
+        f'"{column}" TEXT PRIMARY KEY' if column == 'video_id' else f'"{column}" TEXT'
+        for column in columns
+    )
+
+
+def validate_fields(fields: Iterable[str], columns: list[str] = COLUMNS) -> list[str]:
+    """Returns the fields to read, every column when no field
+    is given, and raises an error for the unknown columns"""
+    fields = list(fields) or list(columns)
+    for field in fields:
+        if field not in columns:
+            raise ValueError(f'{field} is not a valid column')
+    return fields
+
+
+class BaseSink:
+    """A sink receives a stream of models and persists them
+    in batches. Rows are buffered until `batch_size` rows are
+    pending or until `flush_interval` seconds have passed since
+    the last flush which keeps the memory bounded regardless
+    of the size of the crawl
+
+    >>> instance = Videos('Arlette pop the baloon', limit=2)
+    ... with SQLiteSink('videos.sqlite') as sink:
+    ...     instance.objects.pipe(sink)
+    """
+
+    columns = COLUMNS
+
+    def __init__(self, batch_size: int = 500, flush_interval: Optional[float] = 5):
+        if batch_size < 1:
+            raise ValueError('Batch size should be greater than 0')
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer: list[dict[str, str]] = []
+        self.last_flush = time.monotonic()
+        self.total_written = 0
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} [{self.total_written}]>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def serialize(self, item: DC) -> dict[str, str]:
+        """Transforms a model into a flat row that can be
+        written by the sink"""
+        return serialize_model(item, self.columns)
+
+    def should_flush(self):
+        if len(self.buffer) >= self.batch_size:
+            return True
+
+        if self.flush_interval is not None:
+            elapsed = time.monotonic() - self.last_flush
+            return elapsed >= self.flush_interval
+        return False
+
+    def write(self, item: DC):
+        """Adds a single model to the buffer and flushes
+        the buffer when necessary"""
+        self.buffer.append(self.serialize(item))
+        if self.should_flush():
+            self.flush()
+
+    def consume(self, items: Iterable[DC]) -> int:
+        """Writes every model of the stream to the sink and
+        returns the number of models that were consumed"""
+        count = 0
+        for item in items:
+            self.write(item)
+            count = count + 1
+        self.flush()
+        return count
+
+    def consume_pages(self, pages: Iterable[Iterable[DC]]) -> int:
+        """Writes every model of a stream of pages to the sink and
+        returns the number of models that were consumed. The buffer
+        is also flushed between two pages once `flush_interval` has
+        passed so that the rows are not held while the next page is
+        being requested"""
+        count = 0
+        for models in pages:
+            for item in models:
+                self.write(item)
+                count = count + 1
+
+            if self.should_flush():
+                self.flush()
+        self.flush()
+        return count
+
+    def flush(self):
+        if self.buffer:
+            self.write_batch(self.buffer)
+            self.total_written = self.total_written + len(self.buffer)
+            self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def write_batch(self, rows: list[dict[str, str]]):
+        """Needs to be implemented by the subclasses in order
+        to persist a batch of rows"""
+        raise NotImplementedError
+
+    def iter_rows(self, fields: list[str]) -> Iterator[tuple]:
+        """Needs to be implemented by the subclasses in order
+        to read the stored rows back"""
+        raise NotImplementedError
+
+    def values_list(self, *fields: str) -> list[OrderedDict]:
+        """Returns a subset of values matching the given
+        fields from the stored rows
+
+        >>> sink.values_list('video_id', 'channel__channel_id')
+        ... [OrderedDict({'video_id': 'MVkuHKIPWgs', 'channel__channel_id': 'UC...'})]
+        """
+        fields = validate_fields(fields, self.columns)
+
+        self.flush()
+        return [
+            OrderedDict(zip(fields, row))
+            for row in self.iter_rows(fields)
+        ]
+
+    def close(self):
+        self.flush()
+
+
+class SQLiteSink(BaseSink):
+    """Stores the models in a SQLite database. Rows are upserted
+    on `video_id` so that running the same crawl twice does not
+    create duplicates"""
+
+    def __init__(self, path: str, table_name: str = 'videos', **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.table_name = table_name
+        self.connection = sqlite3.connect(path)
+        self.create_table()
+
+    def create_table(self):
+        definitions = column_definitions(self.columns)
+
+        with self.connection:
+            self.connection.execute(
+                f'CREATE TABLE IF NOT EXISTS "{self.table_name}" ({definitions})'
+            )
+
+            for column in ['channel__channel_id', 'search_key']:
+                self.connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{self.table_name}_{column}" '
+                    f'ON "{self.table_name}" ("{column}")'
+                )
+
+    @property
+    def upsert_statement(self):
+        columns = ', '.join(f'"{x}"' for x in self.columns)
+        placeholders = ', '.join(f':{x}' for x in self.columns)
+        updates = ', '.join(
+            f'"{x}" = excluded."{x}"'
+            for x in self.columns
+            if x != 'video_id'
+        )
+        return (
+            f'INSERT INTO "{self.table_name}" ({columns}) VALUES ({placeholders}) '
+            f'ON CONFLICT(video_id) DO UPDATE SET {updates}'
+        )
+
+    def write_batch(self, rows):
+        with self.connection:
+            self.connection.executemany(self.upsert_statement, rows)
+
+    def iter_rows(self, fields):
+        columns = ', '.join(f'"{x}"' for x in fields)
+        cursor = self.connection.execute(
+            f'SELECT {columns} FROM "{self.table_name}"'
+        )
+        yield from cursor
+
+    def close(self):
+        super().close()
+        self.connection.close()
+
+
+class ParquetSink(BaseSink):
+    """Stores the models in a Parquet file. Each flush is
+    appended to the file as a new row group. This sink
+    requires `pyarrow` to be installed"""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                'ParquetSink requires pyarrow. '
+                'Install it with: pip install pyarrow'
+            )
+
+        self.path = path
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([
+            (column, pyarrow.string())
+            for column in self.columns
+        ])
+        self.closed = False
+        self.has_footer = False
+        self.writer_path = None
+        self.writer = self.open_writer()
+
+    def open_writer(self):
+        """Opens a writer on the file. A Parquet file cannot be
+        appended to once its footer is written so, after the rows
+        were read back, the existing row groups are copied to a new
+        file which replaces the previous one once it is complete"""
+        if not self.has_footer:
+            self.writer_path = self.path
+            return self.pyarrow.parquet.ParquetWriter(self.path, self.schema)
+
+        self.writer_path = f'{self.path}.tmp'
+        writer = self.pyarrow.parquet.ParquetWriter(self.writer_path, self.schema)
+        parquet_file = self.pyarrow.parquet.ParquetFile(self.path)
+        for index in range(parquet_file.num_row_groups):
+            writer.write_table(parquet_file.read_row_group(index))
+        return writer
+
+    def close_writer(self):
+        """Writes the footer of the file which is
+        required to read the file back"""
+        self.writer.close()
+        self.writer = None
+
+        if self.writer_path != self.path:
+            os.replace(self.writer_path, self.path)
+        self.has_footer = True
+
+    def write_batch(self, rows):
+        if self.closed:
+            raise ValueError('Cannot write to a closed ParquetSink')
+
+        if self.writer is None:
+            self.writer = self.open_writer()
+
+        table = self.pyarrow.Table.from_pylist(rows, schema=self.schema)
+        self.writer.write_table(table)
+
+    def iter_rows(self, fields):
+        # The sink stays open: the next write
+        # reopens a writer on the file
+        if self.writer is not None:
+            self.close_writer()
+
+        parquet_file = self.pyarrow.parquet.ParquetFile(self.path)
+        for batch in parquet_file.iter_batches(columns=fields):
+            columns = [batch.column(x).to_pylist() for x in fields]
+            yield from zip(*columns)
+
+    def close(self):
+        if not self.closed:
+            super().close()
+            if self.writer is not None:
+                self.close_writer()
+            self.closed = True
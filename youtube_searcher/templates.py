@@ -0,0 +1,121 @@
+import json
+from typing import TYPE_CHECKING, Optional
+
+from youtube_searcher.typings import B
+
+if TYPE_CHECKING:
+    from requests import PreparedRequest
+    from requests.structures import CaseInsensitiveDict
+
+
+class RequestTemplate:
+    """A request template holds the parts of a request that do not
+    change between two searches of the same kind: the url, the
+    headers and the pre-serialized payload. Only the variable
+    fields of the payload (e.g. the query or the continuation
+    token) are serialized when a request is created
+
+    >>> template = RequestTemplate.from_search(Videos('Arlette'))
+    ... template.prepare({'query': 'Arlette pop the baloon'})
+    ... <PreparedRequest [POST]>
+    """
+
+    def __init__(self, url: str, headers: 'CaseInsensitiveDict', payload: dict[str, str]):
+        self.url = url
+        self.headers = headers
+
+        body = json.dumps(payload)
+        # The variable fields are appended to the serialized
+        # static payload e.g. '{"context": {...}' + ', "query": "..."}'
+        self.prefix = body[:-1].encode('utf-8')
+        self.separator = b', ' if payload else b''
+
+    def __repr__(self):
+        return f'<RequestTemplate [{self.url}]>'
+
+    @classmethod
+    def from_search(cls, search_instance: B):
+        """Creates the template using the current state
+        of the search instance"""
+        from requests import Request, Session
+
+        payload = search_instance.get_payload()
+        for key in search_instance.template_variables:
+            payload.pop(key, None)
+
+        url = search_instance.get_url()
+        if url is None:
+            raise ValueError('url cannot be None')
+
+        # Prepare a request once in order to get the
+        # default headers that the session would add
+        request = Request(method='post', url=url, data=b'{}')
+        prepared_request = Session().prepare_request(request)
+
+        headers = prepared_request.headers
+        headers.update(search_instance.get_headers())
+        headers.pop('Content-Length', None)
+        return cls(prepared_request.url, headers, payload)
+
+    def render(self, variables: dict[str, str]) -> bytes:
+        """Returns the serialized payload containing
+        the given variable fields"""
+        if not variables:
+            return self.prefix + b'}'
+
+        fields = ', '.join(
+            f'{json.dumps(key)}: {json.dumps(value)}'
+            for key, value in variables.items()
+        )
+        return self.prefix + self.separator + fields.encode('utf-8') + b'}'
+
+    def prepare(self, variables: dict[str, str]) -> 'PreparedRequest':
+        from requests import PreparedRequest
+        from requests.hooks import default_hooks
+
+        body = self.render(variables)
+
+        headers = self.headers.copy()
+        headers['Content-Length'] = str(len(body))
+
+        request = PreparedRequest()
+        request.method = 'POST'
+        request.url = self.url
+        request.headers = headers
+        request.body = body
+        request.hooks = default_hooks()
+        return request
+
+
+class TemplateCache:
+    """Stores one template per search class, language, region and
+    search preferences. The cache is not locked: two threads building
+    the same template at the same time create identical templates"""
+
+    def __init__(self, maxsize: Optional[int] = 1024):
+        self.maxsize = maxsize
+        self.templates: dict[tuple, RequestTemplate] = {}
+
+    def __repr__(self):
+        return f'<TemplateCache [{len(self.templates)}]>'
+
+    def __len__(self):
+        return len(self.templates)
+
+    def get(self, search_instance: B) -> RequestTemplate:
+        key = search_instance.get_template_key()
+
+        template = self.templates.get(key)
+        if template is None:
+            if self.maxsize is not None and len(self.templates) >= self.maxsize:
+                self.templates.clear()
+
+            template = RequestTemplate.from_search(search_instance)
+            self.templates[key] = template
+        return template
+
+    def clear(self):
+        self.templates.clear()
+
+
+template_cache = TemplateCache()
@@ -0,0 +1,302 @@
+import json
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass
+from typing import (TYPE_CHECKING, Awaitable, Callable, Hashable, Optional,
+                    TypeVar)
+
+from youtube_searcher.pool import ClientPool, is_failure_status
+from youtube_searcher.typings import B, D
+
+# The HTTP client, asyncio and concurrent.futures are only
+# imported when the first request is sent which keeps the
+# import of the search classes fast for short lived processes
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Future
+
+    from requests import Response, Session
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share the same key: the
+    first caller executes the function while the other callers
+    wait for its result. Every caller receives the same object
+    (or the same exception). Once the call completes, the key
+    is released and the next call executes the function again
+
+    >>> single_flight = SingleFlight()
+    ... single_flight.do('key', lambda: session.send(request).json())
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: dict[Hashable, 'Future'] = {}
+
+    def __repr__(self):
+        return f'<SingleFlight [{len(self.calls)}]>'
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        from concurrent.futures import Future
+
+        with self.lock:
+            future = self.calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self.calls[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+
+class AsyncSingleFlight:
+    """The asyncio equivalent of `SingleFlight`. Calls are
+    coalesced per event loop. The call runs in its own task
+    that every caller, the first one included, waits for: a
+    caller being cancelled does not cancel the call for the
+    others and the call is only cancelled once no caller is
+    waiting for it anymore"""
+
+    def __init__(self):
+        self.calls: dict[tuple[int, Hashable], 'asyncio.Task'] = {}
+        self.waiters: Counter[tuple[int, Hashable]] = Counter()
+
+    def __repr__(self):
+        return f'<AsyncSingleFlight [{len(self.calls)}]>'
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        call_key = (id(loop), key)
+
+        task = self.calls.get(call_key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self.calls[call_key] = task
+
+            def release(_):
+                # Once the call completes, the next
+                # call executes the function again
+                if self.calls.get(call_key) is task:
+                    del self.calls[call_key]
+            task.add_done_callback(release)
+
+        self.waiters[call_key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self.waiters[call_key] -= 1
+            if self.waiters[call_key] == 0:
+                del self.waiters[call_key]
+                if not task.done():
+                    task.cancel()
+
+
+@dataclass(frozen=True)
+class Transfer:
+    """The size of the body of a response on the
+    wire and once it was decompressed"""
+
+    url: str
+    wire_bytes: int
+    decoded_bytes: int
+    content_encoding: str
+
+
+class TransferStats:
+    """Records the size of the responses received by a transport.
+    The totals are kept for the lifetime of the transport while
+    only the last `maxlen` transfers are kept individually. The
+    content encodings show whether compression was negotiated
+
+    >>> Videos.transport.stats.summary()
+    ... {'requests': 10, 'wire_bytes': 61440, 'decoded_bytes': 512000, ...}
+    """
+
+    def __init__(self, maxlen: int = 1000):
+        self.lock = threading.Lock()
+        self.transfers: deque[Transfer] = deque(maxlen=maxlen)
+        self.requests = 0
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.encodings: Counter[str] = Counter()
+
+    def __repr__(self):
+        return f'<TransferStats [{self.requests}]>'
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        if self.wire_bytes == 0:
+            return None
+        return self.decoded_bytes / self.wire_bytes
+
+    def record(self, transfer: Transfer):
+        with self.lock:
+            self.transfers.append(transfer)
+            self.requests = self.requests + 1
+            self.wire_bytes = self.wire_bytes + transfer.wire_bytes
+            self.decoded_bytes = self.decoded_bytes + transfer.decoded_bytes
+            self.encodings[transfer.content_encoding] += 1
+
+    def summary(self) -> dict[str, object]:
+        return {
+            'requests': self.requests,
+            'wire_bytes': self.wire_bytes,
+            'decoded_bytes': self.decoded_bytes,
+            'compression_ratio': self.compression_ratio,
+            'encodings': dict(self.encodings)
+        }
+
+
+class Transport:
+    """The transport sends the requests created by the search
+    instances and decodes the responses. When `coalesce` is True,
+    identical requests (same url and payload) that are in flight
+    at the same time are only sent once and every caller gets
+    the same decoded response. The decoded response is shared
+    and should therefore not be modified"""
+
+    def __init__(self, coalesce: bool = True, pool: Optional[ClientPool] = None, max_attempts: int = 3, chunk_size: int = 64 * 1024, timeout: Optional[float] = 30):
+        if max_attempts < 1:
+            raise ValueError('Max attempts should be greater than 0')
+
+        self.coalesce = coalesce
+        self.pool = pool
+        # The number of members of the pool that are
+        # tried before the request is considered failed
+        self.max_attempts = max_attempts
+        self.single_flight = SingleFlight()
+        self.async_single_flight = AsyncSingleFlight()
+        self.session: Optional['Session'] = None
+        # The size of the chunks that are read from
+        # the socket and decompressed at a time
+        self.chunk_size = chunk_size
+        # The timeout used for the searches that
+        # do not define their own `timeout`
+        self.timeout = timeout
+        self.stats = TransferStats()
+
+    def __repr__(self):
+        return f'<Transport [coalesce={self.coalesce}, pool={self.pool}]>'
+
+    def get_session(self) -> 'Session':
+        """Returns the session shared by the requests sent
+        through this transport so that connections are reused"""
+        if self.session is None:
+            from requests import Session
+
+            self.session = Session()
+        return self.session
+
+    def get_timeout(self, search_instance: B) -> Optional[float]:
+        timeout = getattr(search_instance, 'timeout', None)
+        return self.timeout if timeout is None else timeout
+
+    def fetch(self, search_instance: B) -> D:
+        if self.pool is not None:
+            return self.fetch_with_pool(search_instance)
+
+        session, request = search_instance.create_request()
+        timeout = self.get_timeout(search_instance)
+        response = session.send(request, stream=True, timeout=timeout)
+        return self.decode(response)
+
+    def decode(self, response: 'Response') -> D:
+        """Decompresses the body of the response as it is read
+        from the socket and decodes the JSON directly from the
+        decompressed bytes. The compressed and decompressed sizes
+        of the body are recorded in `stats`"""
+        from urllib3 import HTTPResponse
+
+        raw = getattr(response, 'raw', None)
+        if not isinstance(raw, HTTPResponse):
+            return response.json()
+
+        buffer = bytearray()
+        try:
+            for chunk in raw.stream(self.chunk_size, decode_content=True):
+                buffer.extend(chunk)
+        except BaseException:
+            response.close()
+            raise
+        else:
+            raw.release_conn()
+
+        self.stats.record(Transfer(
+            url=response.url,
+            wire_bytes=raw.tell(),
+            decoded_bytes=len(buffer),
+            content_encoding=response.headers.get('Content-Encoding', 'identity')
+        ))
+        return json.loads(buffer)
+
+    def fetch_with_pool(self, search_instance: B) -> D:
+        """Sends the request using the members of the pool. When a
+        member fails, it is ejected and the request is sent again
+        using another member. A timeout, while connecting or while
+        reading the body, counts as a failure of the member"""
+        attempted = []
+        timeout = self.get_timeout(search_instance)
+
+        for attempt in range(self.max_attempts):
+            is_last_attempt = attempt == self.max_attempts - 1
+            member = self.pool.acquire(exclude=attempted)
+            attempted.append(member)
+
+            _, request = search_instance.create_request(client_profile=member.profile)
+
+            try:
+                response = member.session.send(request, stream=True, timeout=timeout)
+                if not is_failure_status(response.status_code):
+                    response_data = self.decode(response)
+            except Exception as e:
+                self.pool.release(member, error=e)
+                if is_last_attempt:
+                    raise
+                continue
+
+            self.pool.release(member, status_code=response.status_code)
+            if is_failure_status(response.status_code):
+                response.close()
+                if is_last_attempt:
+                    response.raise_for_status()
+                continue
+            return response_data
+
+    def send(self, search_instance: B) -> D:
+        if not self.coalesce:
+            return self.fetch(search_instance)
+
+        key = search_instance.get_request_key()
+        return self.single_flight.do(key, lambda: self.fetch(search_instance))
+
+    async def asend(self, search_instance: B) -> D:
+        import asyncio
+
+        async def fetch():
+            return await asyncio.to_thread(self.fetch, search_instance)
+
+        if not self.coalesce:
+            return await fetch()
+
+        key = search_instance.get_request_key()
+        return await self.async_single_flight.do(key, fetch)
+
+
+default_transport = Transport()
@@ -0,0 +1,266 @@
+import datetime
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from youtube_searcher.constants import SearchModes
+from youtube_searcher.models.videos import VideoModel
+from youtube_searcher.search import Videos
+from youtube_searcher.transport import Transport
+
+
+@dataclass
+class WatchedQuery:
+    """A query polled by the watcher and its schedule. The
+    interval grows while the results do not change and is
+    reset to `interval` as soon as they do"""
+
+    query: str
+    interval: float = 60
+    jitter: float = 0.1
+    max_interval: float = 3600
+    livestreams: bool = False
+    search_kwargs: dict[str, str] = field(default_factory=dict)
+    current_interval: float = 0
+    next_run: float = 0
+    video_ids: Optional[frozenset[str]] = None
+    polls: int = 0
+    changes: int = 0
+    last_error: Optional[Exception] = None
+    removed: bool = False
+
+    def __post_init__(self):
+        self.current_interval = self.interval
+
+    def __repr__(self):
+        return f'<WatchedQuery [{self.query}, every {self.current_interval:.0f}s]>'
+
+
+@dataclass(frozen=True)
+class WatchEvent:
+    """A video that appeared in or disappeared from the first
+    page of results of a query. Only the video ID is known
+    for the videos that disappeared"""
+
+    query: str
+    kind: str
+    video_id: str
+    video: Optional[VideoModel] = None
+    detected_at: Optional[datetime.datetime] = None
+
+    def __repr__(self):
+        return f'<WatchEvent [{self.kind}: {self.video_id}]>'
+
+
+class Watcher:
+    """Polls the first page of results of many queries, each on
+    its own interval with a random jitter, and emits an event for
+    each video that appeared or disappeared since the previous
+    poll. The interval of a query is multiplied by `backoff_factor`
+    each time its results do not change (or the poll fails) up to
+    its `max_interval` which keeps the queries that rarely change
+    from being fetched needlessly. The first poll of a query
+    reports all of its videos as appeared
+
+    >>> watcher = Watcher()
+    ... watcher.add('Arlette pop the baloon', interval=30, livestreams=True)
+    ... for event in watcher.watch():
+    ...     print(event.kind, event.video_id)
+    """
+
+    def __init__(
+        self,
+        transport: Optional[Transport] = None,
+        max_workers: int = 8,
+        backoff_factor: float = 2,
+        clock: Callable[[], float] = time.monotonic,
+        seed: Optional[int] = None
+    ):
+        if backoff_factor < 1:
+            raise ValueError('Backoff factor should be greater or equal to 1')
+
+        self.transport = transport
+        self.max_workers = max_workers
+        self.backoff_factor = backoff_factor
+        self.clock = clock
+        self.random = random.Random(seed)
+        self.queries: dict[str, WatchedQuery] = {}
+        self.schedule: list[tuple[float, int, WatchedQuery]] = []
+        self.counter = itertools.count()
+        # Created on the first poll and reused by the next
+        # ones so that the threads are not created again on
+        # every tick
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+    def __repr__(self):
+        return f'<Watcher [{len(self.queries)}]>'
+
+    def __len__(self):
+        return len(self.queries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_executor(self) -> ThreadPoolExecutor:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self.executor
+
+    def close(self):
+        """Stops the threads used to poll the queries. The
+        watcher can still be used afterwards"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def add(self, query: str, interval: float = 60, jitter: float = 0.1, max_interval: Optional[float] = None, livestreams: bool = False, **search_kwargs: str) -> WatchedQuery:
+        """Watches the query. It is polled for the first
+        time on the next call to `run_pending`"""
+        if interval <= 0:
+            raise ValueError('Interval should be greater than 0')
+
+        self.remove(query)
+
+        watched = WatchedQuery(
+            query,
+            interval=interval,
+            jitter=jitter,
+            max_interval=max(interval, max_interval or interval * 60),
+            livestreams=livestreams,
+            search_kwargs=search_kwargs
+        )
+        self.queries[query] = watched
+        self.reschedule(watched, self.clock())
+        return watched
+
+    def remove(self, query: str):
+        watched = self.queries.pop(query, None)
+        if watched is not None:
+            # The entry is skipped when it
+            # is popped from the schedule
+            watched.removed = True
+
+    def reschedule(self, watched: WatchedQuery, next_run: float):
+        watched.next_run = next_run
+        entry = (next_run, next(self.counter), watched)
+        heapq.heappush(self.schedule, entry)
+
+    def next_delay(self, watched: WatchedQuery) -> float:
+        jitter = self.random.uniform(-watched.jitter, watched.jitter)
+        return watched.current_interval * (1 + jitter)
+
+    def create_search(self, watched: WatchedQuery):
+        instance = Videos(watched.query, limit=None, **watched.search_kwargs)
+        if watched.livestreams:
+            instance.search_preferences = SearchModes.livestreams
+
+        if self.transport is not None:
+            instance.transport = self.transport
+        return instance
+
+    def fetch(self, watched: WatchedQuery) -> dict[str, VideoModel]:
+        """Returns the videos of the first page of results
+        of the query indexed by their video ID"""
+        instance = self.create_search(watched)
+        pages = instance.objects.iter_pages(cache=False)
+        try:
+            return {video.video_id: video for video in next(pages, [])}
+        finally:
+            pages.close()
+
+    def poll(self, watched: WatchedQuery) -> list[WatchEvent]:
+        """Fetches the first page of the query, compares it with
+        the previous one and updates the interval of the query"""
+        watched.polls = watched.polls + 1
+
+        try:
+            videos = self.fetch(watched)
+        except Exception as e:
+            watched.last_error = e
+            self.back_off(watched)
+            return []
+
+        watched.last_error = None
+        previous = watched.video_ids or frozenset()
+        current = frozenset(videos)
+        watched.video_ids = current
+
+        detected_at = datetime.datetime.now(datetime.timezone.utc)
+        events = [
+            WatchEvent(watched.query, 'appeared', video_id, videos[video_id], detected_at)
+            for video_id in current - previous
+        ]
+        events.extend(
+            WatchEvent(watched.query, 'disappeared', video_id, detected_at=detected_at)
+            for video_id in previous - current
+        )
+
+        if events:
+            watched.changes = watched.changes + 1
+            watched.current_interval = watched.interval
+        else:
+            self.back_off(watched)
+        return events
+
+    def back_off(self, watched: WatchedQuery):
+        watched.current_interval = min(
+            watched.current_interval * self.backoff_factor,
+            watched.max_interval
+        )
+
+    def pop_due(self, now: float) -> list[WatchedQuery]:
+        due = []
+        while self.schedule and self.schedule[0][0] <= now:
+            _, _, watched = heapq.heappop(self.schedule)
+            if not watched.removed:
+                due.append(watched)
+        return due
+
+    def run_pending(self) -> list[WatchEvent]:
+        """Polls the queries that are due concurrently
+        and returns the events that were detected"""
+        due = self.pop_due(self.clock())
+        if not due:
+            return []
+
+        results = list(self.get_executor().map(self.poll, due))
+
+        now = self.clock()
+        for watched in due:
+            if not watched.removed:
+                self.reschedule(watched, now + self.next_delay(watched))
+        return list(itertools.chain.from_iterable(results))
+
+    def time_until_next(self) -> Optional[float]:
+        while self.schedule and self.schedule[0][2].removed:
+            heapq.heappop(self.schedule)
+
+        if not self.schedule:
+            return None
+        return max(0, self.schedule[0][0] - self.clock())
+
+    def watch(self, stop_event: Optional[threading.Event] = None) -> Iterator[WatchEvent]:
+        """Polls the queries on their schedule and yields the
+        events as they are detected until `stop_event` is set
+        or there are no queries left to watch. The threads are
+        stopped once the iteration ends"""
+        stop_event = stop_event or threading.Event()
+
+        try:
+            while not stop_event.is_set():
+                yield from self.run_pending()
+
+                delay = self.time_until_next()
+                if delay is None:
+                    break
+                stop_event.wait(delay)
+        finally:
+            self.close()
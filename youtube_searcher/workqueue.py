@@ -0,0 +1,397 @@
+import contextlib
+import dataclasses
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+from youtube_searcher.search import ChannelVideos, Videos
+from youtube_searcher.sinks import (COLUMNS, column_definitions,
+                                    serialize_model, validate_fields)
+from youtube_searcher.transport import Transport
+
+
+@dataclass
+class Task:
+    """A unit of work: the first page of a query (or of a channel
+    search) or the page that follows a continuation token"""
+
+    kind: str
+    query: str = ''
+    channel_id: str = ''
+    continuation_key: str = ''
+    page: int = 0
+    task_id: Optional[int] = None
+    attempts: int = 0
+    lease_token: Optional[str] = None
+
+    def __repr__(self):
+        return f'<Task [{self.kind}: {self.query}, page={self.page}]>'
+
+    @classmethod
+    def videos(cls, query: str):
+        return cls('videos', query=query)
+
+    @classmethod
+    def channel(cls, channel_id: str, query: str = ''):
+        return cls('channel', query=query, channel_id=channel_id)
+
+    @property
+    def key(self):
+        """Identifies the work so that the same page
+        is never queued twice"""
+        return json.dumps([
+            self.kind,
+            self.query,
+            self.channel_id,
+            self.continuation_key
+        ])
+
+    def next(self, continuation_key: str):
+        """Returns the task for the page that follows"""
+        return dataclasses.replace(
+            self,
+            continuation_key=continuation_key,
+            page=self.page + 1,
+            task_id=None,
+            attempts=0,
+            lease_token=None
+        )
+
+
+class LeaseExpiredError(Exception):
+    """Raised when a worker completes a task after its lease
+    expired and the task was handed to another worker"""
+
+
+class BaseQueueBackend:
+    """The interface of the stores that hold the shared crawl. A
+    backend for a Redis-like store would typically keep the pending
+    tasks in a list, the leased tasks in a sorted set scored by lease
+    expiry (expired leases are moved back to the list), the task keys
+    in a set and the results in a hash keyed by `video_id` written
+    with HSETNX in the same transaction that removes the task"""
+
+    def put(self, tasks: list[Task]) -> int:
+        """Queues the tasks and returns the number of tasks
+        that were added. Tasks that were already queued
+        are ignored"""
+        raise NotImplementedError
+
+    def lease(self, visibility_timeout: float = 60) -> Optional[Task]:
+        """Returns the next available task which becomes invisible
+        to the other workers for `visibility_timeout` seconds or
+        None when there are no available tasks"""
+        raise NotImplementedError
+
+    def complete(self, task: Task, results: list[dict[str, str]], tasks: Optional[list[Task]] = None) -> int:
+        """Atomically stores the results, queues the discovered tasks
+        and marks the task as done. Results are committed exactly once
+        per `video_id`. Raises `LeaseExpiredError` if the lease of the
+        task is no longer held. Returns the number of new results"""
+        raise NotImplementedError
+
+    def fail(self, task: Task, error: str, retry_delay: float = 0):
+        """Releases the lease of a task that could not be processed
+        so that it can be retried"""
+        raise NotImplementedError
+
+    def stats(self) -> dict[str, int]:
+        raise NotImplementedError
+
+    def values_list(self, *fields: str) -> list[OrderedDict]:
+        raise NotImplementedError
+
+
+class SQLiteQueueBackend(BaseQueueBackend):
+    """Stores the tasks and the results in a SQLite database which
+    can be shared by several processes on the same host. Each thread
+    uses its own connection and writes are serialized by SQLite's
+    database lock
+
+    >>> backend = SQLiteQueueBackend('crawl.sqlite')
+    ... backend.put([Task.videos('Arlette pop the baloon')])
+    ... Worker(backend).run()
+    """
+
+    def __init__(self, path: str, max_attempts: int = 5, timeout: float = 30):
+        self.path = str(path)
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.local = threading.local()
+        self.create_tables()
+
+    def __repr__(self):
+        return f'<SQLiteQueueBackend [{self.path}]>'
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        connection = getattr(self.local, 'connection', None)
+        # Connections cannot be shared with
+        # child processes after a fork
+        if connection is None or self.local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return connection
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self.connection
+        # Take the write lock immediately so that two
+        # workers cannot lease the same task
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        else:
+            connection.execute('COMMIT')
+
+    def create_tables(self):
+        with self.transaction() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS tasks ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, '
+                'key TEXT UNIQUE, kind TEXT, query TEXT, channel_id TEXT, '
+                'continuation_key TEXT, page INTEGER, '
+                "status TEXT DEFAULT 'pending', lease_token TEXT, "
+                'visible_at REAL DEFAULT 0, attempts INTEGER DEFAULT 0, '
+                'error TEXT)'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS idx_tasks_status '
+                'ON tasks (status, visible_at)'
+            )
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS results ({column_definitions()})'
+            )
+
+    def _put(self, connection: sqlite3.Connection, tasks: list[Task]) -> int:
+        count = 0
+        for task in tasks:
+            cursor = connection.execute(
+                'INSERT OR IGNORE INTO tasks '
+                '(key, kind, query, channel_id, continuation_key, page) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (
+                    task.key, task.kind, task.query,
+                    task.channel_id, task.continuation_key, task.page
+                )
+            )
+            count = count + cursor.rowcount
+        return count
+
+    def put(self, tasks):
+        with self.transaction() as connection:
+            return self._put(connection, tasks)
+
+    def lease(self, visibility_timeout=60):
+        with self.transaction() as connection:
+            while True:
+                now = time.time()
+                row = connection.execute(
+                    'SELECT id, kind, query, channel_id, continuation_key, page, attempts '
+                    "FROM tasks WHERE status IN ('pending', 'leased') AND visible_at <= ? "
+                    'ORDER BY id LIMIT 1',
+                    (now,)
+                ).fetchone()
+
+                if row is None:
+                    return None
+
+                task = Task(*row[1:6], task_id=row[0], attempts=row[6])
+
+                # Leases that expired count as attempts since
+                # the worker probably crashed on this task
+                if task.attempts >= self.max_attempts:
+                    connection.execute(
+                        "UPDATE tasks SET status = 'failed', lease_token = NULL, "
+                        "error = COALESCE(error, 'Lease expired') WHERE id = ?",
+                        (task.task_id,)
+                    )
+                    continue
+
+                task.lease_token = uuid.uuid4().hex
+                task.attempts = task.attempts + 1
+                connection.execute(
+                    "UPDATE tasks SET status = 'leased', lease_token = ?, "
+                    'visible_at = ?, attempts = ? WHERE id = ?',
+                    (
+                        task.lease_token, now + visibility_timeout,
+                        task.attempts, task.task_id
+                    )
+                )
+                return task
+
+    def complete(self, task, results, tasks=None):
+        columns = ', '.join(f'"{x}"' for x in COLUMNS)
+        placeholders = ', '.join(f':{x}' for x in COLUMNS)
+
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE tasks SET status = 'done', lease_token = NULL "
+                "WHERE id = ? AND lease_token = ? AND status = 'leased'",
+                (task.task_id, task.lease_token)
+            )
+            if cursor.rowcount == 0:
+                raise LeaseExpiredError(f'The lease of {task} expired')
+
+            before = connection.total_changes
+            connection.executemany(
+                f'INSERT OR IGNORE INTO results ({columns}) VALUES ({placeholders})',
+                results
+            )
+            count = connection.total_changes - before
+
+            self._put(connection, tasks or [])
+            return count
+
+    def fail(self, task, error, retry_delay=0):
+        with self.transaction() as connection:
+            status = 'failed' if task.attempts >= self.max_attempts else 'pending'
+            connection.execute(
+                'UPDATE tasks SET status = ?, lease_token = NULL, visible_at = ?, '
+                'error = ? WHERE id = ? AND lease_token = ?',
+                (
+                    status, time.time() + retry_delay,
+                    error, task.task_id, task.lease_token
+                )
+            )
+
+    def stats(self):
+        rows = self.connection.execute(
+            'SELECT status, COUNT(*) FROM tasks GROUP BY status'
+        ).fetchall()
+
+        stats = {'pending': 0, 'leased': 0, 'done': 0, 'failed': 0}
+        stats.update(dict(rows))
+        stats['results'] = self.connection.execute(
+            'SELECT COUNT(*) FROM results'
+        ).fetchone()[0]
+        return stats
+
+    def values_list(self, *fields):
+        fields = validate_fields(fields)
+        columns = ', '.join(f'"{x}"' for x in fields)
+        cursor = self.connection.execute(f'SELECT {columns} FROM results')
+        return [OrderedDict(zip(fields, row)) for row in cursor]
+
+
+class Worker:
+    """A worker leases tasks from the shared backend, fetches one
+    page per task and commits the results. The continuation token
+    of the page is queued as a new task so that the next page can
+    be fetched by any worker. Several workers, in several processes
+    or on several hosts, can drain the same backend
+
+    >>> backend = SQLiteQueueBackend('crawl.sqlite')
+    ... Worker(backend, max_pages=5).run()
+    """
+
+    def __init__(
+        self,
+        backend: BaseQueueBackend,
+        worker_id: Optional[str] = None,
+        visibility_timeout: float = 60,
+        max_pages: Optional[int] = None,
+        transport: Optional[Transport] = None,
+        retry_delay: float = 5,
+        **search_kwargs: str
+    ):
+        self.backend = backend
+        self.worker_id = worker_id or f'{socket.gethostname()}-{os.getpid()}'
+        self.visibility_timeout = visibility_timeout
+        self.max_pages = max_pages
+        self.transport = transport
+        self.retry_delay = retry_delay
+        self.search_kwargs = search_kwargs
+        self.processed = 0
+        self.failed = 0
+
+    def __repr__(self):
+        return f'<Worker [{self.worker_id}]>'
+
+    def create_search(self, task: Task):
+        kwargs = self.search_kwargs | {'limit': None}
+
+        if task.kind == 'videos':
+            instance = Videos(task.query, **kwargs)
+        elif task.kind == 'channel':
+            instance = ChannelVideos(task.query, task.channel_id, **kwargs)
+        else:
+            raise ValueError(f'Unknown task kind: {task.kind}')
+
+        if self.transport is not None:
+            instance.transport = self.transport
+        return instance
+
+    def process(self, task: Task) -> tuple[list[dict[str, str]], list[Task]]:
+        """Fetches the page of the task and returns the results
+        and the task for the next page if there is one"""
+        instance = self.create_search(task)
+
+        pages = instance.objects.iter_pages(
+            cache=False,
+            continuation_key=task.continuation_key or None
+        )
+        results = [serialize_model(model) for model in next(pages)]
+        pages.close()
+
+        tasks = []
+        token = instance.continuation_key
+        if token and token != task.continuation_key:
+            if self.max_pages is None or task.page + 1 < self.max_pages:
+                tasks.append(task.next(token))
+        return results, tasks
+
+    def run_once(self) -> bool:
+        """Processes a single task. Returns False when
+        there was no task available"""
+        task = self.backend.lease(self.visibility_timeout)
+        if task is None:
+            return False
+
+        try:
+            results, tasks = self.process(task)
+        except Exception as e:
+            self.failed = self.failed + 1
+            self.backend.fail(task, repr(e), retry_delay=self.retry_delay)
+            return True
+
+        try:
+            self.backend.complete(task, results, tasks)
+        except LeaseExpiredError:
+            # Another worker took over the task,
+            # its results will be committed instead
+            return True
+
+        self.processed = self.processed + 1
+        return True
+
+    def run(self, max_tasks: Optional[int] = None, poll_interval: float = 1, stop_when_empty: bool = True):
+        """Processes tasks until the queue is empty (or forever when
+        `stop_when_empty` is False) or `max_tasks` were processed"""
+        count = 0
+        while max_tasks is None or count < max_tasks:
+            if self.run_once():
+                count = count + 1
+                continue
+
+            stats = self.backend.stats()
+            if stop_when_empty and stats['pending'] == 0 and stats['leased'] == 0:
+                break
+            time.sleep(poll_interval)
+        return count